@@ -1,5 +1,10 @@
 import os
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from flask import Flask
+from flask.logging import default_handler
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
@@ -22,6 +27,10 @@ migrate = Migrate()
 login_manager = LoginManager()
 mail = Mail()
 
+# Records from the `app` package are handed to a background listener thread, so
+# request and worker threads never block on (or contend for) the output stream.
+_log_listener = None
+
 def create_app(config_name=None):
     app = Flask(__name__)
     
@@ -31,6 +40,8 @@ def create_app(config_name=None):
     
     app.config.from_object(f'config.{config_name.capitalize()}Config')
     
+    configure_logging(app)
+    
     # Initialize Sentry
     if app.config.get('SENTRY_DSN'):
         sentry_sdk.init(
@@ -89,6 +100,38 @@ def create_app(config_name=None):
     
     return app
 
+def configure_logging(app):
+    """Route the `app` logger (and so app.tasks, app.veo_client, ...) through a QueueHandler"""
+    global _log_listener
+    if _log_listener is None:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter('[%(asctime)s] %(levelname)s in %(name)s: %(message)s'))
+        _log_listener = QueueListener(queue.SimpleQueue(), stream_handler, respect_handler_level=True)
+        _log_listener.start()
+        atexit.register(_stop_log_listener)
+    
+    app.logger.removeHandler(default_handler)
+    if not any(isinstance(h, QueueHandler) for h in app.logger.handlers):
+        app.logger.addHandler(QueueHandler(_log_listener.queue))
+    app.logger.setLevel('DEBUG' if app.debug else app.config.get('LOG_LEVEL', 'INFO'))
+
+def _stop_log_listener():
+    """Flush and stop whichever listener this process is running"""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+def _restart_log_listener():
+    """Start a fresh listener in a forked child (gunicorn preload_app workers)"""
+    # The parent's thread doesn't exist after fork, so records would pile up in
+    # the queue unwritten; a new listener drains the same queue.
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener = QueueListener(_log_listener.queue, *_log_listener.handlers, respect_handler_level=True)
+        _log_listener.start()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_log_listener)
+
 def init_database(app):
     """Initialize database and ensure required columns exist"""
     try:
@@ -2,6 +2,7 @@ from flask import request, jsonify, current_app
 from app.admin import bp
 from app.auth.utils import admin_required
 from app.models import db, User, Video, CreditTransaction, PromptPack, ApiUsage
+from app.tasks import get_queue_stats
 from sqlalchemy import func
 from datetime import datetime, timedelta
 import sqlalchemy as sa
@@ -42,9 +43,10 @@ def admin_analytics_dashboard():
     """Admin dashboard analytics"""
     # Get basic stats
     total_users = User.query.count()
-    total_videos = Video.query.count()
-    completed_videos = Video.query.filter_by(status='completed').count()
-    failed_videos = Video.query.filter_by(status='failed').count()
+    queue_stats = get_queue_stats(max_age=0)
+    total_videos = queue_stats['total']
+    completed_videos = queue_stats['completed']
+    failed_videos = queue_stats['failed']
     
     # Revenue stats (from credit transactions)
     total_credits_purchased = db.session.query(
@@ -55,8 +57,8 @@ def admin_analytics_dashboard():
     ).scalar() or 0
     
     # Queue stats
-    pending_videos = Video.query.filter_by(status='pending').count()
-    processing_videos = Video.query.filter_by(status='processing').count()
+    pending_videos = queue_stats['pending']
+    processing_videos = queue_stats['processing']
     
     # Subscription tier distribution
     tier_distribution = db.session.query(
@@ -2,7 +2,7 @@ from flask import Blueprint, request, jsonify, current_app
 from app.models import User, Video, db
 from app.auth.rate_limit import rate_limit
 from app.auth.utils import verify_token
-from app.tasks import generate_video_task
+from app.tasks import start_video_generation, get_queue_stats, get_queue_positions
 import time
 from datetime import datetime
 from sqlalchemy import or_, and_
@@ -74,12 +74,8 @@ def generate_video_api():
     user.last_api_call = datetime.utcnow()
     db.session.commit()
     
-    # Queue the video generation task using background thread
+    # Queue the video generation task on the background worker pool
     try:
-        import threading
-        from app import create_app
-        import os
-        
         # DUPLICATE PREVENTION: Check if video is already being processed
         if video.status == 'processing':
             return jsonify({
@@ -99,19 +95,7 @@ def generate_video_api():
                 'credits_remaining': user.credits
             }), 200
         
-        def run_video_generation():
-            try:
-                # Always create a new app context for background thread
-                config_name = 'testing' if os.environ.get('FLASK_ENV') == 'testing' else None
-                app = create_app(config_name)
-                with app.app_context():
-                    generate_video_task(video.id)
-            except Exception as e:
-                print(f"❌ API Background thread error: {e}")
-        
-        thread = threading.Thread(target=run_video_generation)
-        thread.daemon = True
-        thread.start()
+        start_video_generation(video.id, video.quality)
         
     except Exception as e:
         # If task execution fails, mark as failed and refund credits
@@ -161,7 +145,7 @@ def video_status_api(video_id):
         response_data.update({
             'video_url': video.gcs_signed_url,
             'duration': video.duration,
-            'thumbnail_url': video.thumbnail_url,
+            'thumbnail_url': video.get_thumbnail_url(),
             'completed_at': video.completed_at.isoformat() if video.completed_at else None
         })
     elif video.status == 'failed':
@@ -217,7 +201,7 @@ def list_videos_api():
             video_data.update({
                 'video_url': video.gcs_signed_url,
                 'duration': video.duration,
-                'thumbnail_url': video.thumbnail_url
+                'thumbnail_url': video.get_thumbnail_url()
             })
         
         video_list.append(video_data)
@@ -285,9 +269,11 @@ def queue_status_api():
         status='pending'
     ).order_by(Video.priority.desc(), Video.queued_at.asc()).all()
     
+    positions = get_queue_positions([video.id for video in pending_videos])
+    
     queue_info = []
     for video in pending_videos:
-        position = get_queue_position(video.id)
+        position = positions.get(video.id)
         wait_time = estimate_wait_time(video.priority)
         queue_info.append({
             'video_id': video.id,
@@ -299,14 +285,13 @@ def queue_status_api():
         })
     
     # Get overall queue stats
-    total_pending = Video.query.filter_by(status='pending').count()
-    processing_count = Video.query.filter_by(status='processing').count()
+    queue_stats = get_queue_stats()
     
     return jsonify({
         'user_videos': queue_info,
         'queue_stats': {
-            'total_pending': total_pending,
-            'currently_processing': processing_count,
+            'total_pending': queue_stats['pending'],
+            'currently_processing': queue_stats['processing'],
             'user_pending_count': len(pending_videos)
         }
     })
@@ -711,7 +711,7 @@ def api_search():
                 'display_title': video.get_display_title(60),
                 'prompt': video.prompt[:200] + '...' if video.prompt and len(video.prompt) > 200 else video.prompt,
                 'description': video.description[:150] + '...' if video.description and len(video.description) > 150 else video.description,
-                'thumbnail_url': video.thumbnail_url,
+                'thumbnail_url': video.get_thumbnail_url(),
                 'video_url': video.gcs_signed_url,
                 'views': video.views or 0,
                 'duration': video.duration,
@@ -1,6 +1,7 @@
 from functools import wraps
 from flask import request, jsonify, current_app
 import jwt
+import logging
 from datetime import datetime, timedelta
 from app.models import User
 
@@ -35,19 +36,20 @@ def login_required(f):
     """Decorator to require authentication"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        # Add debugging output
-        current_app.logger.info("=== LOGIN_REQUIRED DEBUG ===")
-        current_app.logger.info(f"Request headers: {dict(request.headers)}")
-        current_app.logger.info(f"Request cookies: {dict(request.cookies)}")
+        # This runs on every authenticated request; only copy headers and cookies
+        # into log lines when someone is actually debugging auth.
+        debug = current_app.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            current_app.logger.debug("=== LOGIN_REQUIRED DEBUG ===")
+            current_app.logger.debug("Request headers: %s", dict(request.headers))
+            current_app.logger.debug("Request cookies: %s", dict(request.cookies))
         
         # Check for token in Authorization header first
         token = request.headers.get('Authorization')
-        current_app.logger.info(f"Authorization header: {token}")
         
         # If no Authorization header, check for token in cookies (for web requests)
         if not token:
             token = request.cookies.get('auth_token')
-            current_app.logger.info(f"Auth token from cookies: {token[:20] if token else 'None'}...")
         
         if not token:
             current_app.logger.error("No Authorization header or auth_token cookie found")
@@ -66,12 +68,10 @@ def login_required(f):
         
         if token.startswith('Bearer '):
             token = token[7:]
-            current_app.logger.info(f"Extracted token: {token[:20]}...")
-        else:
-            current_app.logger.info(f"Token (no Bearer prefix): {token[:20]}...")
         
         user_id = verify_token(token)
-        current_app.logger.info(f"Token verification result - User ID: {user_id}")
+        if debug:
+            current_app.logger.debug("Token verification result - User ID: %s", user_id)
         
         if not user_id:
             current_app.logger.error("Token verification failed - invalid or expired token")
@@ -87,7 +87,6 @@ def login_required(f):
                 return redirect(url_for('auth.login_page', session_expired='true'))
         
         user = User.query.get(user_id)
-        current_app.logger.info(f"User lookup result: {user.email if user else 'NOT FOUND'}")
         
         if not user:
             current_app.logger.error(f"User not found for ID: {user_id}")
@@ -1,7 +1,58 @@
 from flask import current_app, render_template
 from flask_mail import Message
 from app import mail
+import atexit
 import os
+import smtplib
+import threading
+
+# Completion emails are sent from a couple of long-lived background threads;
+# each keeps its SMTP connection open between emails instead of repeating the
+# connect/STARTTLS/login handshake for every message.
+_smtp = threading.local()
+# Every thread's open connection, so they can be closed cleanly at shutdown
+_open_connections = set()
+_open_connections_lock = threading.Lock()
+
+def _close_connection(conn):
+    """Close a pooled SMTP connection, even if the server already dropped it"""
+    with _open_connections_lock:
+        _open_connections.discard(conn)
+    try:
+        conn.__exit__(None, None, None)
+    except (smtplib.SMTPException, OSError):
+        # QUIT can't be sent on a dead connection; just release the socket
+        if conn.host is not None:
+            conn.host.close()
+
+def _close_open_connections():
+    """Say QUIT on every pooled connection when the process exits"""
+    with _open_connections_lock:
+        connections = list(_open_connections)
+    for conn in connections:
+        _close_connection(conn)
+
+atexit.register(_close_open_connections)
+
+def _send_pooled(msg):
+    """Send msg over this thread's persistent SMTP connection, reconnecting once if it was dropped"""
+    for attempt in range(2):
+        conn = getattr(_smtp, 'conn', None)
+        if conn is None:
+            conn = mail.connect()
+            conn.__enter__()
+            _smtp.conn = conn
+            with _open_connections_lock:
+                _open_connections.add(conn)
+        try:
+            conn.send(msg)
+            return
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            # Servers close idle connections; close ours, open a fresh one and retry once
+            _smtp.conn = None
+            _close_connection(conn)
+            if attempt:
+                raise
 
 def send_auth_email(to_email, template, token):
     """Send authentication email"""
@@ -312,7 +363,7 @@ def send_video_complete_email(user_email, video_id, video_url):
     )
     
     try:
-        mail.send(msg)
+        _send_pooled(msg)
         current_app.logger.info(f"Video complete email sent successfully to {user_email}")
         return True
     except Exception as e:
@@ -1,24 +1,49 @@
 import os
 from datetime import timedelta, datetime
 from google.cloud import storage
-from flask import current_app
+from google.api_core.exceptions import NotFound, PreconditionFailed
+from requests.adapters import HTTPAdapter
+from flask import current_app, url_for
 import hashlib
+from functools import lru_cache
 import re
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
 def get_gcs_bucket_name():
-    """Get the correct GCS bucket name from environment or config."""
+    """Get the correct GCS bucket name from environment or config (read once per process)."""
     return os.environ.get('GCS_BUCKET_NAME', 'prompt-veo-videos')
 
+# Sized for every thread that can talk to GCS at once: the generation workers
+# plus the thumbnail pool (one per core) uploading alongside them, so concurrent
+# uploads keep their connections instead of re-handshaking.
+HTTP_POOL_SIZE = int(os.environ.get('VIDEO_WORKER_THREADS', 32)) + (os.cpu_count() or 2)
+
+# storage.Client is safe to share; building one resolves credentials and opens
+# a new HTTP transport, so do it once per process.
+_storage_client = None
+_storage_client_lock = threading.Lock()
+
 def get_gcs_client():
-    """Get a Google Cloud Storage client, relying on Application Default Credentials."""
-    try:
-        return storage.Client()
-    except Exception as e:
-        logger.error(f"❌ GCS: Failed to initialize Storage Client: {e}")
-        return None
+    """Get the shared Google Cloud Storage client, relying on Application Default Credentials."""
+    global _storage_client
+    if _storage_client is None:
+        # Worker threads can race here on a cold start; build exactly one client.
+        with _storage_client_lock:
+            if _storage_client is None:
+                try:
+                    client = storage.Client()
+                    # Background workers upload concurrently; the default pool keeps only
+                    # 10 connections per host and discards the rest after each request.
+                    client._http.mount('https://', HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE))
+                except Exception as e:
+                    logger.error(f"❌ GCS: Failed to initialize Storage Client: {e}")
+                    return None
+                _storage_client = client
+    return _storage_client
 
 def generate_signed_url(gcs_url, duration_days=7):
     """Generate a signed URL for a GCS object, or return public URL if bucket is public."""
@@ -30,7 +55,8 @@ def generate_signed_url(gcs_url, duration_days=7):
         if gcs_url.startswith('gs://'):
             # Convert gs://bucket-name/path to https://storage.googleapis.com/bucket-name/path
             public_url = gcs_url.replace('gs://', 'https://storage.googleapis.com/')
-            logger.info(f"✅ GCS: Using public URL: {public_url}")
+            # Runs for every video on every listing page; keep it out of INFO
+            logger.debug("✅ GCS: Using public URL: %s", public_url)
             return public_url
             
         # If it's already an HTTP URL, return as-is
@@ -44,7 +70,20 @@ def generate_signed_url(gcs_url, duration_days=7):
         logger.error(f"❌ GCS: Failed to generate URL for {gcs_url}: {e}")
         return "https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/BigBuckBunny.mp4"
 
-# Cache for thumbnail URLs to avoid repeated GCS calls
+# Served by the app itself, so a missing thumbnail costs viewers one cached fetch
+# from our origin instead of a request per video to a third-party image service.
+# A 1200x630 PNG, since social crawlers (og:image) don't render SVG.
+PLACEHOLDER_THUMBNAIL_FILENAME = 'img/video-placeholder.png'
+
+def get_placeholder_thumbnail_url():
+    """Absolute URL of the placeholder thumbnail, resolved per request (never stored)."""
+    try:
+        return url_for('static', filename=PLACEHOLDER_THUMBNAIL_FILENAME, _external=True)
+    except RuntimeError:
+        # Outside a request (CLI, background jobs) there is no host to build from
+        return f"/static/{PLACEHOLDER_THUMBNAIL_FILENAME}"
+
+# Cache for thumbnail URLs to avoid repeated GCS calls; None means "no thumbnail"
 _thumbnail_cache = {}
 
 def generate_signed_thumbnail_url(video_gcs_url, duration_days=7):
@@ -56,23 +95,20 @@ def generate_signed_thumbnail_url(video_gcs_url, duration_days=7):
         return None
     
     # Check cache first
-    if video_gcs_url in _thumbnail_cache:
-        return _thumbnail_cache[video_gcs_url]
-    
+    if video_gcs_url not in _thumbnail_cache:
+        _thumbnail_cache[video_gcs_url] = _find_thumbnail_url(video_gcs_url)
+    return _thumbnail_cache[video_gcs_url] or get_placeholder_thumbnail_url()
+
+def _find_thumbnail_url(video_gcs_url):
+    """Public URL of a known thumbnail for the video, or None."""
     # Simple placeholder for mock/fallback URLs
     if 'mock-bucket' in video_gcs_url or 'fallback' in video_gcs_url:
-        result = "https://placehold.co/1280x720/e2e8f0/e2e8f0/png?text=."
-        _thumbnail_cache[video_gcs_url] = result
-        return result
+        return None
 
     try:
         if not video_gcs_url.startswith('gs://'):
             # Fallback for non-GCS URLs
-            filename = video_gcs_url.split('/')[-1] if '/' in video_gcs_url else video_gcs_url
-            video_id = filename.split('_')[0] if '_' in filename else 'Unknown'
-            result = f"https://placehold.co/1280x720/3b82f6/ffffff?text=🎬+Video+{video_id}&font=montserrat"
-            _thumbnail_cache[video_gcs_url] = result
-            return result
+            return None
         
         # Parse the video filename to extract components
         # Example: gs://prompt-veo-videos/videos/2025/08/free/13_bfd18b58_20250803_182209.mp4
@@ -82,16 +118,12 @@ def generate_signed_thumbnail_url(video_gcs_url, duration_days=7):
         # Extract video ID and hash: "13_bfd18b58"
         if '_' not in filename:
             logger.warning(f"❌ GCS: Unexpected video filename format: {filename}")
-            result = f"https://placehold.co/1280x720/6b7280/ffffff?text=🎬+Video&font=montserrat"
-            _thumbnail_cache[video_gcs_url] = result
-            return result
+            return None
             
         parts = filename.split('_')
         if len(parts) < 2:
             logger.warning(f"❌ GCS: Cannot parse video filename: {filename}")
-            result = f"https://placehold.co/1280x720/6b7280/ffffff?text=🎬+Video&font=montserrat"
-            _thumbnail_cache[video_gcs_url] = result
-            return result
+            return None
             
         video_id = parts[0]  # "13"
         video_hash = parts[1]  # "bfd18b58"
@@ -107,26 +139,21 @@ def generate_signed_thumbnail_url(video_gcs_url, duration_days=7):
         if video_gcs_url in known_thumbnails:
             result = known_thumbnails[video_gcs_url]
             logger.info(f"✅ GCS: Using known thumbnail: {result}")
-            _thumbnail_cache[video_gcs_url] = result
             return result
         
         # For unknown videos, just return placeholder immediately (no GCS API calls)
-        result = f"https://placehold.co/1280x720/3b82f6/ffffff?text=🎬+Video+{video_id}&font=montserrat"
-        logger.info(f"ℹ️ GCS: Using placeholder for video {video_id}")
-        _thumbnail_cache[video_gcs_url] = result
-        return result
+        logger.debug("ℹ️ GCS: Using placeholder for video %s", video_id)
+        return None
         
     except Exception as e:
         logger.error(f"❌ GCS: Error generating thumbnail URL for {video_gcs_url}: {e}")
-        filename = video_gcs_url.split('/')[-1] if '/' in video_gcs_url else 'Unknown'
-        video_id = filename.split('_')[0] if '_' in filename else 'Unknown'
-        result = f"https://placehold.co/1280x720/6b7280/ffffff?text=🎬+Video+{video_id}&font=montserrat"
-        _thumbnail_cache[video_gcs_url] = result
-        return result
+        return None
+
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w\-_.]')
 
 def sanitize_filename(filename):
     """Sanitize a string to be a valid filename."""
-    filename = re.sub(r'[^\w\-_.]', '_', filename)
+    filename = _UNSAFE_FILENAME_CHARS.sub('_', filename)
     return filename[:200]
 
 def generate_video_filename(video_id, quality='free', prompt=None, user_id=None):
@@ -185,10 +212,10 @@ def get_file_info_from_gcs(gcs_url):
         bucket = storage_client.bucket(parsed['bucket_name'])
         blob = bucket.blob(parsed['full_path'])
         
-        if not blob.exists():
+        try:
+            blob.reload()
+        except NotFound:
             return {'exists': False}
-            
-        blob.reload()
         return {
             'exists': True,
             'size': blob.size,
@@ -226,7 +253,15 @@ def upload_file_to_gcs(local_file_path, gcs_blob_name):
         bucket = storage_client.bucket(bucket_name)
         blob = bucket.blob(gcs_blob_name)
         
-        blob.upload_from_filename(local_file_path)
+        # Object names are unique per upload, so make it create-only: with a
+        # generation precondition the client retries transient failures itself.
+        # Files up to 8 MiB go up in a single multipart request. GCS verifies the
+        # crc32c (computed by google-crc32c's C extension) before storing the object.
+        try:
+            blob.upload_from_filename(local_file_path, if_generation_match=0, checksum='crc32c')
+        except PreconditionFailed:
+            # A retried request whose first attempt had already landed
+            logger.info(f"ℹ️ GCS: {gcs_blob_name} already uploaded")
         
         gcs_url = f"gs://{bucket_name}/{gcs_blob_name}"
         logger.info(f"✅ GCS: Successfully uploaded {local_file_path} to {gcs_url}")
@@ -235,6 +270,32 @@ def upload_file_to_gcs(local_file_path, gcs_blob_name):
         logger.error(f"❌ GCS: Error uploading {local_file_path} to GCS: {e}")
         return None
 
+def copy_gcs_file(source_gcs_url, gcs_blob_name):
+    """Copy an existing GCS object to gcs_blob_name without routing the bytes through this host."""
+    try:
+        storage_client = get_gcs_client()
+        if not storage_client:
+            raise Exception("Could not create GCS client.")
+        
+        parsed = parse_gcs_filename(source_gcs_url)
+        source_blob = storage_client.bucket(parsed['bucket_name']).blob(parsed['full_path'])
+        
+        bucket_name = get_gcs_bucket_name()
+        blob = storage_client.bucket(bucket_name).blob(gcs_blob_name)
+        
+        # rewrite() works across buckets and locations; large objects may take
+        # several calls, each resuming from the returned token.
+        token, _, _ = blob.rewrite(source_blob, if_generation_match=0)
+        while token is not None:
+            token, _, _ = blob.rewrite(source_blob, token=token, if_generation_match=0)
+        
+        gcs_url = f"gs://{bucket_name}/{gcs_blob_name}"
+        logger.info(f"✅ GCS: Copied {source_gcs_url} to {gcs_url}")
+        return gcs_url
+    except Exception as e:
+        logger.error(f"❌ GCS: Error copying {source_gcs_url} to {gcs_blob_name}: {e}")
+        return None
+
 def delete_gcs_file(gcs_url):
     """Delete a file from Google Cloud Storage."""
     if not gcs_url or not gcs_url.startswith('gs://'):
@@ -256,13 +317,14 @@ def delete_gcs_file(gcs_url):
         
         logger.info(f"🗑️ GCS: Deleting gs://{bucket_name}/{file_path}")
         
-        if blob.exists():
+        # A single DELETE; a missing object comes back as NotFound
+        try:
             blob.delete()
-            logger.info(f"✅ GCS: Successfully deleted gs://{bucket_name}/{file_path}")
-            return True
-        else:
+        except NotFound:
             logger.warning(f"⚠️ GCS: File does not exist: gs://{bucket_name}/{file_path}")
             return False
+        logger.info(f"✅ GCS: Successfully deleted gs://{bucket_name}/{file_path}")
+        return True
         
     except Exception as e:
         logger.error(f"❌ GCS: Failed to delete {gcs_url}: {e}")
@@ -1,12 +1,20 @@
 from flask import render_template, request, jsonify, current_app, g, redirect, url_for
 from app.main import bp
 from app.models import db, User, Video, PromptPack
+from app.tasks import get_queue_stats, get_queue_positions
 from app.auth.utils import login_required, verify_token
 from app.auth.rate_limit import rate_limit
 import json
 import requests
 import os
+import logging
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+
+# Shared keep-alive session for Gemini prompt suggestions, so each request
+# reuses a pooled TLS connection instead of opening a new one.
+_gemini_session = requests.Session()
+_gemini_session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=16))
 
 @bp.route('/')
 def index():
@@ -77,10 +85,10 @@ def view_prompt_pack(pack_id):
 def generate_video():
     """Generate a video using Veo API"""
     current_app.logger.info("🎬 ===== BACKEND: VIDEO GENERATION REQUEST STARTED =====")
-    current_app.logger.info(f"📋 BACKEND: Request method: {request.method}")
-    current_app.logger.info(f"📋 BACKEND: Request headers: {dict(request.headers)}")
-    current_app.logger.info(f"📋 BACKEND: Request cookies: {dict(request.cookies)}")
-    current_app.logger.info(f"📋 BACKEND: Request data: {request.get_json()}")
+    if current_app.logger.isEnabledFor(logging.DEBUG):
+        current_app.logger.debug("📋 BACKEND: Request headers: %s", dict(request.headers))
+        current_app.logger.debug("📋 BACKEND: Request cookies: %s", dict(request.cookies))
+        current_app.logger.debug("📋 BACKEND: Request data: %s", request.get_json())
     
     try:
         # Get user from token (set by login_required decorator)
@@ -171,10 +179,9 @@ def generate_video():
         db.session.commit()
         current_app.logger.info(f"✅ BACKEND: Video priority updated and committed")
         
-        # Queue the video generation task using background threads
+        # Queue the video generation task on the background worker pool
         try:
-            import threading
-            from app.tasks import generate_video_task
+            from app.tasks import start_video_generation
             
             # DUPLICATE PREVENTION: Check if video is already being processed
             if video.status == 'processing':
@@ -193,26 +200,11 @@ def generate_video():
                     'message': 'Video generation already started'
                 }), 200
             
-            current_app.logger.info("🚀 BACKEND: Starting video generation with background thread")
-            
-            # Start video generation in background thread
-            def run_video_generation():
-                try:
-                    # Always create a new app context for background thread
-                    from app import create_app
-                    config_name = 'testing' if os.environ.get('FLASK_ENV') == 'testing' else None
-                    app = create_app(config_name)
-                    with app.app_context():
-                        generate_video_task(video.id)
-                except Exception as e:
-                    # Use print instead of current_app.logger in background thread
-                    print(f"❌ BACKEND: Background thread error: {e}")
+            current_app.logger.info("🚀 BACKEND: Starting video generation on background worker pool")
             
-            thread = threading.Thread(target=run_video_generation)
-            thread.daemon = True
-            thread.start()
+            start_video_generation(video.id, video.quality)
             
-            current_app.logger.info(f"✅ BACKEND: Video generation started in background thread")
+            current_app.logger.info(f"✅ BACKEND: Video generation queued on background worker pool")
             
             return jsonify({
                 'success': True,
@@ -230,9 +222,7 @@ def generate_video():
             return jsonify({'error': 'Failed to start video generation'}), 500
             
     except Exception as e:
-        current_app.logger.error(f"❌ Exception in generate_video route: {e}")
-        import traceback
-        current_app.logger.error(f"❌ Traceback: {traceback.format_exc()}")
+        current_app.logger.exception(f"❌ Exception in generate_video route: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
 @bp.route('/search')
@@ -625,13 +615,14 @@ def get_queue_position(video_id):
     
     return position + 1
 
-def estimate_wait_time(priority):
+def estimate_wait_time(priority, pending_count=None):
     """Estimate wait time based on priority and current queue"""
     # Get average processing time (in minutes)
     avg_processing_time = 5  # 5 minutes average
     
-    # Count pending videos with similar or higher priority
-    pending_count = Video.query.filter_by(status='pending').count()
+    # Count pending videos unless the caller already has the count
+    if pending_count is None:
+        pending_count = Video.query.filter_by(status='pending').count()
     
     # Estimate based on priority and queue length
     if priority >= 50:  # Enterprise users
@@ -655,10 +646,15 @@ def queue_status():
         status='pending'
     ).order_by(Video.priority.desc(), Video.queued_at.asc()).all()
     
+    # Get overall queue stats and every position up front, instead of
+    # re-querying both for each of the user's videos
+    queue_stats = get_queue_stats()
+    positions = get_queue_positions([video.id for video in pending_videos])
+    
     queue_info = []
     for video in pending_videos:
-        position = get_queue_position(video.id)
-        wait_time = estimate_wait_time(video.priority)
+        position = positions.get(video.id)
+        wait_time = estimate_wait_time(video.priority, queue_stats['pending'])
         
         queue_info.append({
             'video_id': video.id,
@@ -670,15 +666,11 @@ def queue_status():
             'queued_at': video.queued_at.isoformat()
         })
     
-    # Get overall queue stats
-    total_pending = Video.query.filter_by(status='pending').count()
-    processing_count = Video.query.filter_by(status='processing').count()
-    
     return jsonify({
         'user_videos': queue_info,
         'queue_stats': {
-            'total_pending': total_pending,
-            'currently_processing': processing_count,
+            'total_pending': queue_stats['pending'],
+            'currently_processing': queue_stats['processing'],
             'user_pending_count': len(pending_videos)
         },
         'rate_limit_info': user.get_rate_limit_info()
@@ -774,10 +766,10 @@ def ai_suggest():
         }
         
         # Make request to Gemini API
-        response = requests.post(
-            f"{gemini_url}?key={gemini_api_key}",
+        response = _gemini_session.post(
+            gemini_url,
             json=gemini_data,
-            headers={'Content-Type': 'application/json'},
+            headers={'x-goog-api-key': gemini_api_key},
             timeout=30
         )
         
@@ -930,10 +922,10 @@ def ai_suggest_random():
         }
         
         # Make request to Gemini API
-        response = requests.post(
-            f"{gemini_url}?key={gemini_api_key}",
+        response = _gemini_session.post(
+            gemini_url,
             json=gemini_data,
-            headers={'Content-Type': 'application/json'},
+            headers={'x-goog-api-key': gemini_api_key},
             timeout=30
         )
         
@@ -3,9 +3,13 @@ from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask import current_app, url_for, request
 import uuid
+from urllib.parse import urlparse
 
 from app import db
 
+# Hosts of the placeholder images failed thumbnails used to store
+STALE_PLACEHOLDER_HOSTS = ('via.placeholder.com', 'placehold.co')
+
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
     
@@ -268,6 +272,15 @@ class User(UserMixin, db.Model):
 
 class Video(db.Model):
     __tablename__ = 'videos'
+    __table_args__ = (
+        # Partial index: only the small "hot" subset of the queue is indexed
+        db.Index('idx_video_status', 'status',
+                 postgresql_where=db.text("status IN ('pending', 'processing')")),
+        # Matches the queue's ORDER BY, so ranking pending videos reads the
+        # index in order instead of sorting the pending rows
+        db.Index('idx_video_pending_queue', db.text('priority DESC'), 'queued_at',
+                 postgresql_where=db.text("status = 'pending'")),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -283,7 +296,9 @@ class Video(db.Model):
     
     def get_thumbnail_url(self):
         """Get the thumbnail URL, with fallback to dynamic generation."""
-        if self.thumbnail_url:
+        # Failed thumbnails used to store a third-party placeholder; those rows
+        # get the app's own placeholder instead.
+        if self.thumbnail_url and urlparse(self.thumbnail_url).hostname not in STALE_PLACEHOLDER_HOSTS:
             # If thumbnail_url is a GCS URL, convert it to public URL
             if self.thumbnail_url.startswith('gs://'):
                 from app.gcs_utils import generate_signed_url
@@ -777,7 +792,7 @@ class ChallengeSubmission(db.Model):
             'video': {
                 'id': self.video.id,
                 'title': self.video.title,
-                'thumbnail_url': self.video.thumbnail_url,
+                'thumbnail_url': self.video.get_thumbnail_url(),
                 'gcs_signed_url': self.video.gcs_signed_url
             },
             'created_at': self.created_at.isoformat()
@@ -1,386 +1,519 @@
-from flask import current_app
+from flask import current_app, has_app_context
 from app import create_app, db
-from app.models import Video, User, CreditTransaction
+from app.models import Video
 from app.email_utils import send_video_complete_email
-from app.gcs_utils import generate_video_filename, upload_file_to_gcs, generate_thumbnail_filename, get_gcs_bucket_name, parse_gcs_filename
+from app.gcs_utils import generate_video_filename, upload_file_to_gcs, generate_thumbnail_filename, generate_signed_url, delete_gcs_file, copy_gcs_file, get_placeholder_thumbnail_url
+from app.video_processor import VideoProcessor
 from app.veo_client import VeoClient # Use the centralized client
-import requests
-import json
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import joinedload
 import time
-from google.cloud import storage
-from datetime import datetime, timedelta
+from datetime import datetime
 import os
-from google.auth import default
-from google.auth.transport.requests import Request
+import tempfile
+import queue
+import threading
+from concurrent.futures import Future, wait
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Veo generations usually take 60-120s: wait VEO_POLL_FIRST_CHECK seconds before
+# the first status check, poll quickly after that, then settle at
+# VEO_POLL_MAX_DELAY until VEO_POLL_TIMEOUT seconds have passed.
+VEO_POLL_TIMEOUT = int(os.environ.get('VEO_POLL_TIMEOUT', 300))
+VEO_POLL_FIRST_CHECK = int(os.environ.get('VEO_POLL_FIRST_CHECK', 10))
+VEO_POLL_MAX_DELAY = int(os.environ.get('VEO_POLL_MAX_DELAY', 10))
+
+def _poll_delay(attempt):
+    """Seconds to wait before the next Veo status check (2s, 3s, 4.5s, ... capped)."""
+    return min(VEO_POLL_MAX_DELAY, 2 * (1.5 ** min(attempt, 5)))
+
+# Generations spend most of their time waiting on Veo, so they run on a shared
+# pool rather than a fresh OS thread per request; extra jobs wait in the pool's
+# queue (still 'pending') instead of piling up threads.
+VIDEO_WORKER_THREADS = int(os.environ.get('VIDEO_WORKER_THREADS', 32))
+
+# Premium jobs get their own slice of the workers so a backlog of free videos
+# never delays them; the two pools together stay within VIDEO_WORKER_THREADS,
+# which the Veo and GCS connection pools are sized from.
+_POOL_SIZES = {
+    'premium': max(1, VIDEO_WORKER_THREADS // 4),
+    'free': max(1, VIDEO_WORKER_THREADS - VIDEO_WORKER_THREADS // 4),
+    # Completion emails go out on their own small pool, so an SMTP handshake
+    # never occupies a generation worker that a queued video could be using.
+    'email': 2,
+    # Thumbnail extraction is an ffmpeg process per video; cap it at the core
+    # count so overlapping it with uploads never oversubscribes the CPU.
+    'thumbnail': os.cpu_count() or 2,
+}
+
+class _DaemonPool:
+    """Bounded thread pool whose workers are daemon threads.
+    
+    concurrent.futures joins its workers at interpreter exit, so every gunicorn
+    worker restart (max_requests, SIGTERM) would wait for all running Veo
+    generations. Daemon workers are abandoned at exit instead, as the plain
+    threads used before the pools were.
+    """
+    
+    def __init__(self, max_workers, thread_name_prefix):
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._work_queue = queue.SimpleQueue()
+        self._idle = threading.Semaphore(0)
+        self._threads = []
+        self._lock = threading.Lock()
+    
+    def submit(self, fn, *args):
+        future = Future()
+        self._work_queue.put((future, fn, args))
+        # Reuse an idle worker if there is one, otherwise grow up to the cap
+        if not self._idle.acquire(blocking=False):
+            with self._lock:
+                if len(self._threads) < self._max_workers:
+                    thread = threading.Thread(target=self._work, daemon=True,
+                                              name=f'{self._thread_name_prefix}_{len(self._threads)}')
+                    self._threads.append(thread)
+                    thread.start()
+        return future
+    
+    def _work(self):
+        while True:
+            future, fn, args = self._work_queue.get()
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+            del future, fn, args
+            self._idle.release()
+
+_executors = {}
+_executor_lock = threading.Lock()
+
+def _get_pool(name):
+    """Return the named worker pool, created on first use (never in the gunicorn master)."""
+    executor = _executors.get(name)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _executors[name] = _DaemonPool(_POOL_SIZES[name], name)
+    return executor
+
+def _get_executor(quality='free'):
+    return _get_pool('premium' if quality == 'premium' else 'free')
+
+_worker_app = None
+_worker_app_lock = threading.Lock()
+
+def _get_worker_app():
+    """App background jobs run under, built once per process."""
+    global _worker_app
+    if _worker_app is None:
+        with _worker_app_lock:
+            if _worker_app is None:
+                config_name = 'testing' if os.environ.get('FLASK_ENV') == 'testing' else None
+                _worker_app = create_app(config_name)
+    return _worker_app
+
+def _run_video_generation(app, video_id):
+    try:
+        with app.app_context():
+            return generate_video_task(video_id)
+    except Exception as e:
+        logger.error(f"❌ Background video generation error for video {video_id}: {e}")
+        return False
+
+def start_video_generation(video_id, quality='free'):
+    """Queue generate_video_task on the background worker pool for its quality tier.
+    
+    Jobs always run under the process's worker app, never the caller's: a
+    generation outlives the request (or test) that queued it, so it must not
+    touch that app's database after it is torn down.
+    """
+    return _get_executor(quality).submit(_run_video_generation, _get_worker_app(), video_id)
 
 def generate_video_task(video_id):
     """Generate video using Veo API"""
-    from flask import current_app
-    
-    if current_app:
+    if has_app_context():
         return _generate_video_task(video_id)
     
-    from app import create_app
-    config_name = 'testing' if os.environ.get('FLASK_ENV') == 'testing' else None
-    app = create_app(config_name)
-    with app.app_context():
+    with _get_worker_app().app_context():
         return _generate_video_task(video_id)
 
 def _generate_video_task(video_id):
     """Internal function to generate video (with extensive logging)"""
-    from app import db
-    from app.models import Video, User
-    from datetime import datetime
-    import time
-    
     try:
-        video = Video.query.get(video_id)
+        # Load the owner in the same query rather than a second round trip
+        video = db.session.get(Video, video_id, options=[joinedload(Video.user)])
         if not video:
-            print(f"❌ Video {video_id} not found")
+            logger.error(f"❌ Video {video_id} not found")
             return False
         
-        user = User.query.get(video.user_id)
+        user = video.user
         if not user:
-            print(f"❌ User {video.user_id} not found")
+            logger.error(f"❌ User {video.user_id} not found")
             return False
+        # Every commit below expires the loaded rows, and reading one again opens a
+        # transaction that keeps a pooled DB connection checked out through the Veo
+        # call, the poll or the upload. Keep what the job reads up front instead.
+        user_email = user.email
+        prompt, quality, slug, owner_id = video.prompt, video.quality, video.slug, video.user_id
         
         # DUPLICATE PREVENTION: Check if video is already being processed
         if video.status == 'processing':
-            print(f"⚠️ Video {video_id} is already being processed. Skipping duplicate generation.")
+            logger.warning(f"⚠️ Video {video_id} is already being processed. Skipping duplicate generation.")
             return True  # Return True to avoid marking as failed
         
         if video.status == 'completed':
-            print(f"✅ Video {video_id} is already completed. Skipping duplicate generation.")
+            logger.info(f"✅ Video {video_id} is already completed. Skipping duplicate generation.")
             return True
         
         if video.veo_job_id:
-            print(f"⚠️ Video {video_id} already has a Veo job ID: {video.veo_job_id}. Skipping duplicate generation.")
+            logger.warning(f"⚠️ Video {video_id} already has a Veo job ID: {video.veo_job_id}. Skipping duplicate generation.")
             return True
         
-        print(f"🎬 Starting video generation for video {video_id}")
-        
-        video.status = 'processing'
-        video.processing_started_at = datetime.utcnow()
+        # Claim the video atomically: the checks above read a snapshot, but only
+        # one worker's UPDATE can match here, so a concurrent duplicate run exits
+        # instead of starting a second (billable) Veo generation.
+        claimed = db.session.execute(
+            update(Video)
+            .where(Video.id == video_id, Video.status.notin_(('processing', 'completed')), Video.veo_job_id.is_(None))
+            .values(status='processing', started_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        ).rowcount
         db.session.commit()
-        print(f"✅ Updated video status to processing")
+        if not claimed:
+            logger.warning(f"⚠️ Video {video_id} was claimed by another worker. Skipping duplicate generation.")
+            return True
+        
+        logger.info(f"🎬 Starting video generation for video {video_id}")
         
         # Step 1: Call Veo API using the new VeoClient
-        print(f"📋 Step 1/6: Calling Veo API via VeoClient...")
+        logger.info(f"📋 Step 1/6: Calling Veo API via VeoClient...")
         veo_client = VeoClient()
         
         # Currently both free and premium are limited to 8 seconds
         duration = 8   # Both tiers limited to 8 seconds for now
         
-        print(f"🎬 Generating {duration}s video with {video.quality} quality")
-        result = veo_client.generate_video(video.prompt, video.quality, duration)
+        logger.info(f"🎬 Generating {duration}s video with {quality} quality")
+        result = veo_client.generate_video(prompt, quality, duration)
         
         if not result.get('success'):
             error_msg = result.get('error', 'Failed to start video generation')
-            print(f"❌ Failed to get operation name from Veo API: {error_msg}")
-            video.status = 'failed'
-            video.error_message = error_msg
-            db.session.commit()
-            return False
+            logger.error(f"❌ Failed to get operation name from Veo API: {error_msg}")
+            return _fail_video(video, error_msg)
         
         operation_name = result['operation_name']
-        print(f"✅ Veo API operation created: {operation_name}")
+        model_id = result['model_id']
+        logger.info(f"✅ Veo API operation created: {operation_name}")
         video.veo_job_id = operation_name
         db.session.commit()
         
         # Step 2: Poll for completion
-        print(f"📋 Step 2/6: Polling for video completion...")
+        logger.info(f"📋 Step 2/6: Polling for video completion...")
         video_url = None
-        max_attempts = 60
         attempts = 0
+        deadline = time.monotonic() + VEO_POLL_TIMEOUT
+        # A request Veo accepted moments ago is never finished yet; checking
+        # straight away only spends quota.
+        time.sleep(VEO_POLL_FIRST_CHECK)
         
-        while attempts < max_attempts:
+        while True:
             # check_veo_status already uses the new client
-            status_result = check_veo_status(operation_name)
-            if status_result and status_result.get('status') == 'completed':
+            status_result = check_veo_status(operation_name, model_id) or {}
+            status = status_result.get('status')
+            if status == 'completed':
                 video_url = status_result.get('video_url')
-                print(f"✅ Video completed: {video_url}")
+                logger.info(f"✅ Video completed: {video_url}")
                 break
-            elif status_result and status_result.get('status') == 'content_violation':
-                print(f"🚫 Content policy violation detected: {status_result.get('details', 'Unknown violation')}")
-                video.status = 'content_violation'
-                video.error_message = f"Content policy violation: {status_result.get('details', 'Your prompt violated content guidelines. Please try rephrasing it.')}"
-                db.session.commit()
-                return False
-            elif status_result and status_result.get('status') == 'failed':
-                print(f"❌ Video generation failed during polling: {status_result.get('error')}")
-                video.status = 'failed'
-                video.error_message = status_result.get('error', 'Polling failed')
-                db.session.commit()
-                return False
+            elif status == 'content_violation':
+                logger.warning(f"🚫 Content policy violation detected: {status_result.get('details', 'Unknown violation')}")
+                details = status_result.get('details', 'Your prompt violated content guidelines. Please try rephrasing it.')
+                return _fail_video(video, f"Content policy violation: {details}", status='content_violation')
+            elif status == 'failed':
+                logger.error(f"❌ Video generation failed during polling: {status_result.get('error')}")
+                return _fail_video(video, status_result.get('error', 'Polling failed'))
             
-            print(f"⏳ Video still processing... (attempt {attempts + 1}/{max_attempts})")
-            time.sleep(5)
             attempts += 1
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # Never sleep past the deadline, so the last check lands right on it
+            delay = min(_poll_delay(attempts - 1), remaining)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"⏳ Video still processing... (attempt {attempts}, next check in {delay:.1f}s)")
+            time.sleep(delay)
         
         if not video_url:
-            print(f"❌ Video generation timed out after {max_attempts} attempts")
-            video.status = 'failed'
-            video.error_message = 'Video generation timed out'
-            db.session.commit()
-            return False
-        
-        # Step 3: Process video data (download from GCS)
-        print(f"📋 Step 3/7: Downloading video from GCS...")
-        local_path = download_video_from_gcs(video_url)
-        if not local_path:
-            print(f"❌ Failed to download video from GCS")
-            video.status = 'failed'
-            video.error_message = 'Failed to download video from GCS'
-            db.session.commit()
-            return False
-        print(f"✅ Video downloaded from GCS to: {local_path}")
-        
-        # Step 4: Add QR code watermark
-        print(f"📋 Step 4/7: Adding QR code watermark...")
-        try:
-            from app.video_processor import VideoProcessor
-            import tempfile
-            
-            # Create QR code URL for the video
-            qr_url = f"https://slopvids.com/watch/{video_id}-{video.slug}" if video.slug else f"https://slopvids.com/watch/{video_id}"
+            logger.error(f"❌ Video generation timed out after {VEO_POLL_TIMEOUT}s ({attempts} status checks)")
+            return _fail_video(video, 'Video generation timed out')
+        
+        # Everything written locally lives in a per-task directory that is removed
+        # on every exit path, including failures.
+        with tempfile.TemporaryDirectory(prefix=f'veo-{video_id}-') as tmpdir:
+            # Steps 3-4: Add QR code watermark. ffmpeg streams the Veo output from
+            # GCS over HTTP(S) and encodes as it arrives, so the original is never
+            # written to local disk first.
+            video_to_upload = None
+            if VideoProcessor.WATERMARK_ENABLED:
+                logger.info(f"📋 Step 4/7: Adding QR code watermark...")
+                try:
+                    # Create QR code URL for the video
+                    qr_url = f"https://slopvids.com/watch/{video_id}-{slug}" if slug else f"https://slopvids.com/watch/{video_id}"
+                    
+                    watermarked_path = os.path.join(tmpdir, f'{video_id}_watermarked.mp4')
+                    
+                    logger.info(f"🎯 Adding QR code watermark with URL: {qr_url}")
+                    watermark_success = VideoProcessor.add_watermark(
+                        input_path=generate_signed_url(video_url, duration_days=1),
+                        output_path=watermarked_path,
+                        qr_url=qr_url
+                    )
+                    
+                    if watermark_success:
+                        logger.info(f"✅ QR code watermark added successfully")
+                        # Use the watermarked video for upload
+                        video_to_upload = watermarked_path
+                    else:
+                        logger.warning(f"⚠️ Failed to add QR code watermark, using original video")
+                        
+                except Exception as e:
+                    logger.warning(f"⚠️ Error adding QR code watermark: {e}")
+                    logger.warning(f"⚠️ Using original video without watermark")
+            else:
+                logger.info(f"ℹ️ QR watermark disabled, publishing the Veo output as-is (steps 3-4)")
             
-            # Create temporary file for watermarked video
-            with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_watermarked:
-                watermarked_path = temp_watermarked.name
+            # Step 7 runs alongside step 5: the frame only needs the video bytes
+            # (the local file, or else the Veo original), not the organized copy.
+            # If the uploaded file is still on local disk, extract the frame from it
+            # rather than reading the same video back from GCS.
+            if video_to_upload:
+                thumbnail_future = _get_pool('thumbnail').submit(
+                    generate_video_thumbnail_from_local, video_to_upload, video_id, quality, prompt)
+            else:
+                thumbnail_future = _get_pool('thumbnail').submit(
+                    generate_video_thumbnail_from_gcs, video_url, video_id, quality, prompt)
             
-            print(f"🎯 Adding QR code watermark with URL: {qr_url}")
-            watermark_success = VideoProcessor.add_watermark(
-                input_path=local_path,
-                output_path=watermarked_path,
-                qr_url=qr_url
+            # Step 5: Upload to GCS with organized naming
+            logger.info(f"📋 Step 5/7: Re-uploading to organized path in GCS...")
+            gcs_path, filename, organized_gcs_url = generate_video_filename(
+                video_id=video_id,
+                quality=quality,
+                prompt=prompt,
+                user_id=owner_id
             )
             
-            if watermark_success:
-                print(f"✅ QR code watermark added successfully")
-                # Use the watermarked video for upload
-                video_to_upload = watermarked_path
-                # Clean up original local file
-                os.unlink(local_path)
-                local_path = None
-            else:
-                print(f"⚠️ Failed to add QR code watermark, using original video")
-                video_to_upload = local_path
-                
-        except Exception as e:
-            print(f"⚠️ Error adding QR code watermark: {e}")
-            print(f"⚠️ Using original video without watermark")
-            video_to_upload = local_path
-        
-        # Step 5: Upload to GCS with organized naming
-        print(f"📋 Step 5/7: Re-uploading to organized path in GCS...")
-        gcs_path, filename, organized_gcs_url = generate_video_filename(
-            video_id=video_id,
-            quality=video.quality,
-            prompt=video.prompt,
-            user_id=video.user_id
-        )
-        
-        print(f"📁 Using organized path: {gcs_path}")
-        final_gcs_url = upload_file_to_gcs(video_to_upload, gcs_path)
-        if not final_gcs_url:
-            print(f"❌ Failed to upload to GCS")
-            video.status = 'failed'
-            video.error_message = 'Failed to upload to cloud storage'
-            db.session.commit()
-            return False
-        
-        print(f"✅ Video uploaded to GCS: {final_gcs_url}")
-        video.gcs_url = final_gcs_url
-        
-        # Generate signed URL for video access
-        from app.gcs_utils import generate_signed_url
-        signed_url = generate_signed_url(final_gcs_url, duration_days=7)
-        if signed_url:
-            video.gcs_signed_url = signed_url
-            print(f"✅ Signed URL generated: {signed_url[:100]}...")
-        else:
-            print(f"⚠️ Failed to generate signed URL")
-        
-        # Step 6: Clean up original Veo API file
-        print(f"📋 Step 6/7: Cleaning up original Veo API file...")
-        try:
-            from app.gcs_utils import delete_gcs_file
-            if video_url and video_url != final_gcs_url:
-                print(f"🗑️ Deleting original Veo API file: {video_url}")
-                delete_gcs_file(video_url)
-                print(f"✅ Original Veo API file deleted")
-            else:
-                print(f"ℹ️ No original file to clean up")
-        except Exception as e:
-            print(f"⚠️ Failed to clean up original file: {e}")
-        
-        # Step 7: Generate thumbnail
-        print(f"📋 Step 7/8: Generating thumbnail...")
-        try:
-            thumbnail_url = generate_video_thumbnail_from_gcs(final_gcs_url, video_id, video.quality, video.prompt)
-            if thumbnail_url:
-                print(f"✅ Thumbnail generated: {thumbnail_url}")
-                # Save thumbnail URL to video record
-                video.thumbnail_gcs_url = thumbnail_url
-                # Generate public URL for the thumbnail
-                from app.gcs_utils import generate_signed_url
-                thumbnail_public_url = generate_signed_url(thumbnail_url, duration_days=365)
-                if thumbnail_public_url:
-                    video.thumbnail_url = thumbnail_public_url
-                    print(f"✅ Thumbnail public URL generated: {thumbnail_public_url[:100]}...")
+            logger.info(f"📁 Using organized path: {gcs_path}")
+            try:
+                if video_to_upload:
+                    final_gcs_url = upload_file_to_gcs(video_to_upload, gcs_path)
+                else:
+                    # Unchanged bytes are already in GCS: copy them server-side
+                    final_gcs_url = copy_gcs_file(video_url, gcs_path)
+                if not final_gcs_url:
+                    logger.error(f"❌ Failed to upload to GCS")
+                    return _fail_video(video, 'Failed to upload to cloud storage')
+            finally:
+                # The thumbnail reads tmpdir or the Veo original, so it has to finish
+                # before either is removed, on the failure path too.
+                wait([thumbnail_future])
+            
+            logger.info(f"✅ Video uploaded to GCS: {final_gcs_url}")
+            video.gcs_url = final_gcs_url
+            
+            # Generate signed URL for video access
+            signed_url = generate_signed_url(final_gcs_url, duration_days=7)
+            if signed_url:
+                video.gcs_signed_url = signed_url
+                logger.info(f"✅ Signed URL generated: {signed_url[:100]}...")
             else:
-                print(f"⚠️ Failed to generate thumbnail, will use fallback")
-                # Set a placeholder thumbnail URL
-                video.thumbnail_url = f"https://via.placeholder.com/320x180/000000/FFFFFF?text=Video+{video_id}"
-                print(f"✅ Set placeholder thumbnail: {video.thumbnail_url}")
-        except Exception as e:
-            print(f"⚠️ Error generating thumbnail: {e}")
-            # Set a placeholder thumbnail URL as fallback
-            video.thumbnail_url = f"https://via.placeholder.com/320x180/000000/FFFFFF?text=Video+{video_id}"
-            print(f"✅ Set fallback placeholder thumbnail: {video.thumbnail_url}")
-        
+                logger.warning(f"⚠️ Failed to generate signed URL")
+            
+            # Step 6: Clean up original Veo API file
+            logger.info(f"📋 Step 6/7: Cleaning up original Veo API file...")
+            try:
+                if video_url and video_url != final_gcs_url:
+                    logger.info(f"🗑️ Deleting original Veo API file: {video_url}")
+                    delete_gcs_file(video_url)
+                    logger.info(f"✅ Original Veo API file deleted")
+                else:
+                    logger.info(f"ℹ️ No original file to clean up")
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to clean up original file: {e}")
+            
+            # Step 7: Collect the thumbnail started before the upload
+            logger.info(f"📋 Step 7/8: Generating thumbnail...")
+            try:
+                thumbnail_url = thumbnail_future.result()
+                if thumbnail_url:
+                    logger.info(f"✅ Thumbnail generated: {thumbnail_url}")
+                    # Save thumbnail URL to video record
+                    video.thumbnail_gcs_url = thumbnail_url
+                    # Generate public URL for the thumbnail
+                    thumbnail_public_url = generate_signed_url(thumbnail_url, duration_days=365)
+                    if thumbnail_public_url:
+                        video.thumbnail_url = thumbnail_public_url
+                        logger.info(f"✅ Thumbnail public URL generated: {thumbnail_public_url[:100]}...")
+                else:
+                    # Left unset: get_thumbnail_url() resolves the placeholder per request
+                    logger.warning(f"⚠️ Failed to generate thumbnail, will use placeholder")
+            except Exception as e:
+                logger.warning(f"⚠️ Error generating thumbnail, will use placeholder: {e}")
+            
         # Step 8: Update video status
-        print(f"📋 Step 8/8: Finalizing video...")
+        logger.info(f"📋 Step 8/8: Finalizing video...")
         video.status = 'completed'
         video.completed_at = datetime.utcnow()
-        video.processing_duration = (video.completed_at - video.processing_started_at).total_seconds()
+        processing_seconds = (video.completed_at - video.started_at).total_seconds()
         db.session.commit()
                 
-        print(f"🎉 Video {video_id} completed successfully!")
+        logger.info(f"🎉 Video {video_id} completed successfully in {processing_seconds:.0f}s!")
                 
-        # Send completion email
-        try:
-            send_video_complete_email(user.email, video.id, final_gcs_url)
-            print(f"📧 Completion email sent to {user.email}")
-        except Exception as e:
-            print(f"⚠️ Failed to send completion email: {e}")
-        
-        # Clean up temporary files
-        try:
-            if local_path and os.path.exists(local_path):
-                os.unlink(local_path)
-                print(f"🧹 Cleaned up original local video file")
-            if 'watermarked_path' in locals() and watermarked_path and os.path.exists(watermarked_path):
-                os.unlink(watermarked_path)
-                print(f"🧹 Cleaned up watermarked video file")
-        except Exception as e:
-            print(f"⚠️ Failed to clean up temporary files: {e}")
+        # Send completion email without holding this worker for the SMTP round trip
+        _get_pool('email').submit(_send_completion_email, current_app._get_current_object(), user_email, video_id, final_gcs_url)
         
         return True
         
     except Exception as e:
-        print(f"❌ Error in video generation task: {e}")
-        import traceback
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logger.exception(f"❌ Error in video generation task: {e}")
         try:
-            video.status = 'failed'
-            video.error_message = str(e)
-            db.session.commit()
+            _fail_video(video, str(e))
         except:
             pass
         return False
 
-def check_veo_status(operation_name):
+def _send_completion_email(app, user_email, video_id, video_url):
+    with app.app_context():
+        try:
+            if send_video_complete_email(user_email, video_id, video_url):
+                logger.info(f"📧 Completion email sent to {user_email}")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to send completion email: {e}")
+
+def _fail_video(video, error_message, status='failed'):
+    """Record a terminal failure on the video and commit it. Always returns False."""
+    video.status = status
+    video.error_message = error_message
+    db.session.commit()
+    return False
+
+def check_veo_status(operation_name, model_id=None):
     """Check Veo API operation status using the centralized client."""
     try:
         veo_client = VeoClient()
-        return veo_client.check_video_status(operation_name)
+        return veo_client.check_video_status(operation_name, model_id)
     except Exception as e:
-        print(f"❌ Error checking Veo status: {e}")
+        logger.error(f"❌ Error checking Veo status: {e}")
         return {'success': False, 'error': str(e)}
 
 def generate_video_thumbnail_from_gcs(gcs_url, video_id, quality='free', prompt=None):
     """Generate thumbnail from GCS video URL and upload to GCS"""
+    logger.info(f"🖼️ Generating thumbnail for video {video_id} from GCS: {gcs_url}")
+    
+    # ffmpeg reads the object over HTTP(S) with range requests, so only the
+    # moov atom and the frames around the seek point leave GCS and nothing is
+    # written to local disk.
+    video_http_url = generate_signed_url(gcs_url, duration_days=1)
+    return generate_video_thumbnail_from_local(video_http_url, video_id, quality, prompt)
+
+def generate_video_thumbnail_from_local(video_path, video_id, quality='free', prompt=None):
+    """Generate thumbnail from a local video file (or any URL ffmpeg can open) and upload to GCS"""
     try:
-        from app.video_processor import VideoProcessor
-        import tempfile
-        
-        print(f"🖼️ Generating thumbnail for video {video_id} from GCS: {gcs_url}")
+        logger.info(f"🖼️ Generating thumbnail for video {video_id} from: {video_path}")
         
         thumbnail_path, _, _ = generate_thumbnail_filename(video_id, quality, prompt)
-        
-        temp_video_path = download_video_from_gcs(gcs_url)
-        if not temp_video_path:
-            print(f"❌ Failed to download video from GCS")
-            return None
-        
         temp_thumbnail_path = tempfile.mktemp(suffix='.jpg')
         
         try:
-            # Try different time offsets if the first one fails
-            time_offsets = ["00:00:05", "00:00:10", "00:00:15", "00:00:30"]
+            # Fall back to an earlier frame if the first one fails; Veo clips are
+            # 8 seconds long, so seeking any later would never find a frame.
+            time_offsets = ["00:00:05", "00:00:01"]
             
             for offset in time_offsets:
-                print(f"🔄 Trying thumbnail generation at {offset}...")
-                success = VideoProcessor.generate_thumbnail(temp_video_path, temp_thumbnail_path, offset)
+                logger.info(f"🔄 Trying thumbnail generation at {offset}...")
+                success = VideoProcessor.generate_thumbnail(video_path, temp_thumbnail_path, offset)
                 if success:
-                    print(f"✅ Thumbnail generated successfully at {offset}")
+                    logger.info(f"✅ Thumbnail generated successfully at {offset}")
                     break
                 else:
-                    print(f"⚠️ Failed to generate thumbnail at {offset}, trying next...")
+                    logger.warning(f"⚠️ Failed to generate thumbnail at {offset}, trying next...")
             
             if not success:
-                print(f"❌ Failed to generate thumbnail at all time offsets")
+                logger.error(f"❌ Failed to generate thumbnail at all time offsets")
                 return None
             
             # Upload thumbnail to GCS
             thumbnail_gcs_url = upload_file_to_gcs(temp_thumbnail_path, thumbnail_path)
             if thumbnail_gcs_url:
-                print(f"✅ Thumbnail uploaded to GCS: {thumbnail_gcs_url}")
+                logger.info(f"✅ Thumbnail uploaded to GCS: {thumbnail_gcs_url}")
                 return thumbnail_gcs_url
             else:
-                print(f"❌ Failed to upload thumbnail to GCS")
+                logger.error(f"❌ Failed to upload thumbnail to GCS")
                 return None
                 
         finally:
-            # Clean up temporary files
-            if os.path.exists(temp_video_path):
-                os.unlink(temp_video_path)
-                print(f"🧹 Cleaned up temporary video file")
+            # Clean up temporary thumbnail
             if os.path.exists(temp_thumbnail_path):
                 os.unlink(temp_thumbnail_path)
-                print(f"🧹 Cleaned up temporary thumbnail file")
+                logger.info(f"🧹 Cleaned up temporary thumbnail file")
         
     except Exception as e:
-        print(f"❌ Error generating thumbnail from GCS: {e}")
-        import traceback
-        print(f"❌ Traceback: {traceback.format_exc()}")
-        return None
-
-def download_video_from_gcs(gcs_url):
-    """Download video from GCS to a temporary local file."""
-    try:
-        import tempfile
-        
-        parsed = parse_gcs_filename(gcs_url)
-        bucket_name = parsed['bucket_name']
-        file_path = parsed['full_path']
-        
-        # storage.Client() will use Application Default Credentials
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(file_path)
-        
-        if not blob.exists():
-            print(f"❌ Video not found in GCS: {gcs_url}")
-            return None
-        
-        temp_file = tempfile.NamedTemporaryFile(suffix='.mp4', delete=False)
-        blob.download_to_filename(temp_file.name)
-        temp_file.close()
-        
-        print(f"✅ Video downloaded to: {temp_file.name}")
-        return temp_file.name
-        
-    except Exception as e:
-        print(f"❌ Error downloading video from GCS: {e}")
+        logger.exception(f"❌ Error generating thumbnail: {e}")
         return None
 
 def create_text_thumbnail_fallback(video_id):
     """Create a text-based thumbnail as fallback"""
-    return f"https://via.placeholder.com/320x180/000000/FFFFFF?text=Video+{video_id}"
+    return get_placeholder_thumbnail_url()
+
+# Queue status endpoints are polled by every waiting client; serve them from a
+# short-lived per-process snapshot instead of re-counting the table each time.
+QUEUE_STATS_TTL = 5
+
+_queue_stats_cache = (0.0, None)
+
+def get_queue_stats(max_age=QUEUE_STATS_TTL):
+    """Get video counts per queue status with a single GROUP BY query.
+    
+    Results up to max_age seconds old are served from cache; pass 0 for fresh counts.
+    """
+    global _queue_stats_cache
+    fetched_at, stats = _queue_stats_cache
+    if stats is not None and time.monotonic() - fetched_at < max_age:
+        return dict(stats)
+    
+    counts = dict(
+        db.session.query(Video.status, func.count(Video.id)).group_by(Video.status).all()
+    )
+    stats = {
+        'pending': counts.get('pending', 0),
+        'processing': counts.get('processing', 0),
+        'completed': counts.get('completed', 0),
+        'failed': counts.get('failed', 0),
+        'total': sum(counts.values())
+    }
+    _queue_stats_cache = (time.monotonic(), stats)
+    return dict(stats)
+
+def get_queue_positions(video_ids):
+    """Map each pending video id to its 1-based queue position with a single query.
+    
+    Position counts videos ahead by priority, then by queue time (ties share a
+    position).
+    """
+    if not video_ids:
+        return {}
+    ranked = select(
+        Video.id,
+        func.rank().over(order_by=(Video.priority.desc(), Video.queued_at.asc())).label('position')
+    ).where(Video.status == 'pending').subquery()
+    return dict(db.session.execute(
+        select(ranked.c.id, ranked.c.position).where(ranked.c.id.in_(video_ids))
+    ).all())
 
-# Note: The functions `download_video_to_local`, `create_mock_video_file`, 
-# `generate_video_thumbnail`, `process_priority_queue`, and `get_queue_stats` 
-# were either unused, for mock purposes, or have been integrated into the main flow.
-# They are removed for clarity and to avoid confusion.
+# Note: The functions `download_video_to_local`, `download_video_from_gcs`,
+# `create_mock_video_file`, `generate_video_thumbnail` and `process_priority_queue`
+# were either unused, for mock purposes, or have been integrated into the main
+# flow. They are removed for clarity and to avoid confusion.
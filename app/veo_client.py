@@ -1,28 +1,124 @@
 import os
 import logging
+import threading
+import time
 import requests
-import json
-from flask import current_app
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
 # Try to import Google Cloud libraries
 try:
     import google.auth
-    from google.auth.transport.requests import Request
-    from google.cloud import storage
+    from google.auth.transport.requests import Request, AuthorizedSession
+    from app.gcs_utils import generate_signed_url, get_gcs_client
     GOOGLE_CLOUD_AVAILABLE = True
 except ImportError:
     GOOGLE_CLOUD_AVAILABLE = False
     logger.warning("Google Cloud libraries not available. VeoClient will not be able to authenticate.")
 
+# Resolved once at import; the polling loop builds a client per status check.
+PROJECT_ID = os.environ.get('GOOGLE_CLOUD_PROJECT', 'dirly-466300')
+LOCATION = 'us-central1'
+_VEO_MODEL_BASE = f"https://{LOCATION}-aiplatform.googleapis.com/v1/projects/{PROJECT_ID}/locations/{LOCATION}/publishers/google/models/"
+
+VEO_SCOPES = [
+    'https://www.googleapis.com/auth/cloud-platform',
+    'https://www.googleapis.com/auth/aiplatform.googleapis.com'
+]
+
+# Every background worker thread may hold a Veo connection at once; keep that
+# many alive so none is torn down and re-handshaked after use.
+HTTP_POOL_SIZE = int(os.environ.get('VIDEO_WORKER_THREADS', 32))
+
+# One authorized session per worker process. AuthorizedSession refreshes the
+# underlying credentials on expiry/401 and keeps its HTTP connections alive.
+_AUTH_SESSION = None
+_AUTH_LOCK = threading.Lock()
+_RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+def _auth_session():
+    """Return the process-wide AuthorizedSession used for Veo API calls."""
+    global _AUTH_SESSION
+    if _AUTH_SESSION is None:
+        with _AUTH_LOCK:
+            if _AUTH_SESSION is None:
+                gac = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
+                if gac and not os.path.exists(gac):
+                    logger.warning(f"⚠️ VEO: GOOGLE_APPLICATION_CREDENTIALS points to missing file '{gac}', using default service account")
+                    os.environ.pop('GOOGLE_APPLICATION_CREDENTIALS', None)
+                credentials, _ = google.auth.default(scopes=VEO_SCOPES)
+                # Once the token is within a few minutes of expiry, refresh it on
+                # google-auth's background worker and keep sending the still-valid
+                # one, so no Veo call waits on the OAuth round trip; only an
+                # already-expired token is refreshed inline. Older google-auth
+                # releases lack the option and keep refreshing inline.
+                if hasattr(credentials, 'with_non_blocking_refresh'):
+                    credentials.with_non_blocking_refresh()
+                session = AuthorizedSession(credentials)
+                # Pool TLS connections to aiplatform.googleapis.com across polls. Status
+                # retries only apply to idempotent methods, so a 5xx on predictLongRunning
+                # never submits a second (billable) generation.
+                session.mount('https://', HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=HTTP_POOL_SIZE,
+                    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=_RETRY_STATUSES)
+                ))
+                # fetchPredictOperation is a POST but only reads the operation, so
+                # status polls back off and retry transient errors as well.
+                status_adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=HTTP_POOL_SIZE,
+                    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=_RETRY_STATUSES,
+                                      allowed_methods=frozenset({'POST'}))
+                )
+                for model_id in {model_id for model_id, _ in _VEO_TIERS.values()}:
+                    session.mount(f"{_VEO_MODEL_BASE}{model_id}:fetchPredictOperation", status_adapter)
+                logger.info(f"✅ VEO: Created authorized session (credentials: {type(credentials).__name__})")
+                _AUTH_SESSION = session
+    return _AUTH_SESSION
+
+# Status polls only read these fields; a partial response leaves out the
+# operation metadata Veo otherwise returns on every poll. The mask reaches into
+# the Any-typed response, so if the API ever rejects it (400) polls fall back
+# to the full operation for the rest of the process.
+_STATUS_FIELD_MASK = 'done,error,response(raiMediaFilteredCount,raiMediaFilteredReasons,videos(gcsUri))'
+_status_field_mask_rejected = False
+
+# Image-to-video status answers shared between pollers: in-flight operations
+# for a couple of seconds, finished ones (which never change) for ten minutes.
+STATUS_CACHE_TTL = 2
+FINISHED_STATUS_CACHE_TTL = 600
+_status_cache = {}
+_status_cache_lock = threading.Lock()
+
+# Failed Veo calls can answer with a multi-KB HTML error page; only this much of
+# it is kept in the error message that ends up on the video row.
+ERROR_BODY_LIMIT = 512
+
+# Model and fixed request parameters per quality tier; only the prompt, duration
+# and output location vary between generations. Both tiers are currently
+# limited to 8 seconds.
+_VEO_BASE_PARAMETERS = {
+    "aspectRatio": "16:9",
+    "enhancePrompt": True,
+    "sampleCount": 1,
+    "personGeneration": "allow_adult",
+}
+_VEO_TIERS = {
+    'free': ('veo-2.0-generate-001', _VEO_BASE_PARAMETERS),
+    'premium': ('veo-3.0-generate-001', {**_VEO_BASE_PARAMETERS, "generateAudio": True, "resolution": "1080p"}),
+}
+
 class VeoClient:
     """Client for the Google Veo API, simplified for robust authentication."""
     
     def __init__(self):
         """Initialize VeoClient with project configuration."""
-        self.project_id = os.environ.get('GOOGLE_CLOUD_PROJECT', 'dirly-466300')
-        self.location = 'us-central1'
+        self.project_id = PROJECT_ID
+        self.location = LOCATION
         self.model_id = 'veo-2.0-generate-001'  # Default model
 
     def _get_auth_token(self):
@@ -35,6 +131,19 @@ class VeoClient:
             logger.error("❌ VEO: Cannot get auth token because Google Cloud libraries are not installed.")
             return None
 
+        # Normally the process-wide credentials behind the Veo session already hold
+        # a live token; only refresh them when it has expired.
+        try:
+            credentials = _auth_session().credentials
+            if not credentials.valid:
+                with _AUTH_LOCK:
+                    if not credentials.valid:
+                        credentials.refresh(Request())
+            if credentials.token:
+                return credentials.token
+        except Exception as e:
+            logger.warning(f"⚠️ VEO: Shared credentials unavailable ({e}), running full authentication diagnostics")
+
         try:
             # ===== START DEBUGGING =====
             logger.info("🕵️ VEO: Starting authentication process.")
@@ -106,37 +215,10 @@ class VeoClient:
                     logger.warning(f"⚠️ VEO: Compute Engine credentials failed: {e2}")
                     credentials = None
             
-            # Method 3: Try service account credentials
-            if not credentials:
-                try:
-                    logger.info("🔑 VEO: Method 3 - Trying service account credentials...")
-                    from google.oauth2 import service_account
-                    # Try to use the default service account
-                    credentials = service_account.Credentials.from_service_account_info(
-                        {},  # Empty dict to use default
-                        scopes=[
-                            'https://www.googleapis.com/auth/cloud-platform',
-                            'https://www.googleapis.com/auth/aiplatform.googleapis.com'
-                        ]
-                    )
-                    logger.info("✅ VEO: Successfully obtained credentials using service account")
-                    
-                    # Try to refresh
-                    try:
-                        credentials.refresh(Request())
-                        logger.info("✅ VEO: Successfully refreshed service account credentials")
-                    except Exception as refresh_error:
-                        logger.warning(f"⚠️ VEO: Service account credential refresh failed: {refresh_error}")
-                        
-                except Exception as e3:
-                    logger.error(f"❌ VEO: Service account credentials failed: {e3}")
-                    credentials = None
-            
-            # Method 4: Try direct metadata server access (last resort)
+            # Method 3: Try direct metadata server access (last resort)
             if not credentials and is_cloud_run:
                 try:
-                    logger.info("🔑 VEO: Method 4 - Trying direct metadata server access...")
-                    import requests
+                    logger.info("🔑 VEO: Method 3 - Trying direct metadata server access...")
                     
                     # Try to get token directly from metadata server
                     metadata_url = "http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/token"
@@ -176,21 +258,12 @@ class VeoClient:
                 return None
                 
         except Exception as e:
-            logger.error(f"❌ VEO: Failed to get authentication token: {e}")
-            import traceback
-            logger.error(f"❌ VEO: Traceback: {traceback.format_exc()}")
+            logger.exception(f"❌ VEO: Failed to get authentication token: {e}")
             return None
     
     def generate_video(self, prompt, quality='free', duration=8):
         """Generate video using Veo API."""
-        if quality == 'premium':
-            self.model_id = 'veo-3.0-generate-001'
-            max_duration = 8  # Currently limited to 8 seconds for both tiers
-            has_audio = True
-        else:
-            self.model_id = 'veo-2.0-generate-001'
-            max_duration = 8
-            has_audio = False
+        self.model_id, tier_parameters = _VEO_TIERS['premium' if quality == 'premium' else 'free']
 
         # Currently both tiers are limited to 8 seconds
         if duration > 8:
@@ -200,60 +273,49 @@ class VeoClient:
         logger.warning("💰 VEO: Real Veo API call will be made. This may incur costs.")
         logger.info(f"🎬 VEO: Generating {duration}s video with {quality} quality using {self.model_id}")
         
-        token = self._get_auth_token()
-        if not token:
+        if not GOOGLE_CLOUD_AVAILABLE:
             error_msg = "Failed to get a valid authentication token."
             logger.error(f"❌ VEO: {error_msg}")
             return {'success': False, 'error': error_msg}
         
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json'
-        }
-        
         request_data = {
             "instances": [{"prompt": prompt}],
             "parameters": {
+                **tier_parameters,
                 "durationSeconds": duration,
-                "aspectRatio": "16:9",
-                "enhancePrompt": True,
-                "sampleCount": 1,
-                "personGeneration": "allow_adult",
                 "storageUri": f"gs://{get_gcs_bucket_name()}/videos/"
             }
         }
-        
-        if has_audio and quality == 'premium':
-            request_data["parameters"]["generateAudio"] = True
-        if quality == 'premium':
-            request_data["parameters"]["resolution"] = "1080p"
 
-        url = f"https://{self.location}-aiplatform.googleapis.com/v1/projects/{self.project_id}/locations/{self.location}/publishers/google/models/{self.model_id}:predictLongRunning"
+        url = f"{_VEO_MODEL_BASE}{self.model_id}:predictLongRunning"
             
         try:
-            response = requests.post(url, headers=headers, json=request_data, timeout=30)
+            response = _auth_session().post(url, json=request_data, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
                 operation_name = result.get('name')
                 if operation_name:
                     logger.info(f"✅ VEO: Video generation started: {operation_name}")
-                    return {'success': True, 'operation_name': operation_name}
+                    return {'success': True, 'operation_name': operation_name, 'model_id': self.model_id}
                 else:
                     logger.error(f"❌ VEO: No operation name in response: {result}")
                     return {'success': False, 'error': "No operation name in response"}
             else:
-                error_msg = f"API request failed: {response.status_code} - {response.text}"
+                # response.text re-decodes the body on every access; read it once
+                body = response.text
+                lowered_body = body.lower()
+                error_msg = f"API request failed: {response.status_code} - {body[:ERROR_BODY_LIMIT]}"
                 
                 # Provide more helpful error messages for common issues
-                if 'Unsupported output video duration' in response.text:
+                if 'Unsupported output video duration' in body:
                     if quality == 'free':
                         error_msg = f"Free tier only supports videos up to 8 seconds. You requested {duration}s. Upgrade to premium for longer videos."
                     else:
                         error_msg = f"Premium tier supports videos up to 60 seconds. You requested {duration}s."
-                elif 'insufficient quota' in response.text.lower():
+                elif 'insufficient quota' in lowered_body:
                     error_msg = "Veo API quota exceeded. Please try again later or upgrade your plan."
-                elif 'authentication' in response.text.lower():
+                elif 'authentication' in lowered_body:
                     error_msg = "Authentication failed. Please check your Google Cloud credentials."
                 
                 logger.error(f"❌ VEO: {error_msg}")
@@ -263,87 +325,103 @@ class VeoClient:
             logger.error(f"❌ VEO: Exception in generate_video: {e}")
             return {'success': False, 'error': str(e)}
     
-    def check_video_status(self, operation_name):
-        """Check the status of a video generation operation."""
-        if 'veo-3.0' in operation_name:
+    def _parse_completed_result(self, result, operation_name):
+        """Turn a finished (done=True) fetchPredictOperation payload into a status dict."""
+        if 'error' in result:
+            error_msg = result['error'].get('message', 'Unknown error')
+            logger.error(f"❌ VEO: Operation failed: {error_msg}")
+            return {'success': False, 'status': 'failed', 'error': error_msg}
+
+        if 'response' in result:
+            response_data = result['response']
+
+            # Check for content policy violations
+            if 'raiMediaFilteredCount' in response_data and response_data['raiMediaFilteredCount'] > 0:
+                filtered_reasons = response_data.get('raiMediaFilteredReasons', [])
+                reason_text = filtered_reasons[0] if filtered_reasons else "Content policy violation"
+                logger.warning(f"🚫 VEO: Content policy violation detected: {reason_text}")
+                return {
+                    'success': False, 
+                    'status': 'content_violation', 
+                    'error': 'Content policy violation',
+                    'details': reason_text,
+                    'filtered_count': response_data['raiMediaFilteredCount']
+                }
+
+            if 'videos' in response_data and response_data['videos']:
+                video_data = response_data['videos'][0]
+                video_url = video_data.get('gcsUri')
+                if video_url:
+                    return {'success': True, 'status': 'completed', 'video_url': video_url}
+
+        # Fallback if structure is unexpected
+        logger.warning("Operation done but no video URL found in expected path. Trying fallback.")
+        operation_id = operation_name.split('/')[-1]
+
+        # The standard Veo API folder structure first, then the alternative
+        # flat name; both share a prefix, so one listing answers both.
+        bucket_name = get_gcs_bucket_name()
+        existing = list_gcs_blob_names(bucket_name, f"videos/{operation_id}")
+        for blob_name in (f"videos/{operation_id}/sample_0.mp4", f"videos/{operation_id}.mp4"):
+            if blob_name in existing:
+                expected_gcs_url = f"gs://{bucket_name}/{blob_name}"
+                logger.info(f"✅ Found video file in GCS via fallback: {expected_gcs_url}")
+                return {'success': True, 'status': 'completed', 'video_url': expected_gcs_url}
+
+        logger.error("❌ VEO: Operation complete but no video URL found.")
+        return {'success': False, 'status': 'failed', 'error': 'No video data in completed operation.'}
+
+    def check_video_status(self, operation_name, model_id=None):
+        """Check the status of a video generation operation.
+        
+        Pass the model_id returned by generate_video to skip deriving it from
+        the operation name on every poll.
+        """
+        if model_id:
+            self.model_id = model_id
+        elif 'veo-3.0' in operation_name:
             self.model_id = 'veo-3.0-generate-001'
         else:
             self.model_id = 'veo-2.0-generate-001'
         
-        token = self._get_auth_token()
-        if not token:
+        if not GOOGLE_CLOUD_AVAILABLE:
             error_msg = "Failed to get a valid authentication token for status check."
             logger.error(f"❌ VEO: {error_msg}")
             return {'success': False, 'error': error_msg}
 
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json'
-        }
-        
-        fetch_url = f"https://{self.location}-aiplatform.googleapis.com/v1/projects/{self.project_id}/locations/{self.location}/publishers/google/models/{self.model_id}:fetchPredictOperation"
+        fetch_url = f"{_VEO_MODEL_BASE}{self.model_id}:fetchPredictOperation"
         request_data = {"operationName": operation_name}
 
+        global _status_field_mask_rejected
         try:
-            response = requests.post(fetch_url, headers=headers, json=request_data, timeout=30)
+            if _status_field_mask_rejected:
+                response = _auth_session().post(fetch_url, json=request_data, timeout=30)
+            else:
+                response = _auth_session().post(fetch_url, json=request_data, timeout=30,
+                                                headers={'X-Goog-FieldMask': _STATUS_FIELD_MASK})
+                if response.status_code == 400:
+                    # A bad operation name is a 400 too; only drop the mask if the
+                    # unmasked request is accepted.
+                    response = _auth_session().post(fetch_url, json=request_data, timeout=30)
+                    if response.status_code == 200:
+                        logger.warning("⚠️ VEO: Status field mask rejected, polling full operations")
+                        _status_field_mask_rejected = True
             
             if response.status_code == 200:
                 result = response.json()
-                logger.info(f"📡 VEO: Status check response: {result}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"📡 VEO: Status check response: {result}")
                 
                 if result.get('done', False):
-                    if 'error' in result:
-                        error_msg = result['error'].get('message', 'Unknown error')
-                        logger.error(f"❌ VEO: Operation failed: {error_msg}")
-                        return {'success': False, 'status': 'failed', 'error': error_msg}
-                    
-                    if 'response' in result:
-                        response_data = result['response']
-                        
-                        # Check for content policy violations
-                        if 'raiMediaFilteredCount' in response_data and response_data['raiMediaFilteredCount'] > 0:
-                            filtered_reasons = response_data.get('raiMediaFilteredReasons', [])
-                            reason_text = filtered_reasons[0] if filtered_reasons else "Content policy violation"
-                            logger.warning(f"🚫 VEO: Content policy violation detected: {reason_text}")
-                            return {
-                                'success': False, 
-                                'status': 'content_violation', 
-                                'error': 'Content policy violation',
-                                'details': reason_text,
-                                'filtered_count': response_data['raiMediaFilteredCount']
-                            }
-                        
-                        if 'videos' in response_data and response_data['videos']:
-                            video_data = response_data['videos'][0]
-                            video_url = video_data.get('gcsUri')
-                            if video_url:
-                                return {'success': True, 'status': 'completed', 'video_url': video_url}
-                    
-                    # Fallback if structure is unexpected
-                    logger.warning("Operation done but no video URL found in expected path. Trying fallback.")
-                    operation_id = operation_name.split('/')[-1]
-                    
-                    # Try the standard Veo API folder structure first
-                    expected_gcs_url = f"gs://{get_gcs_bucket_name()}/videos/{operation_id}/sample_0.mp4"
-                    
-                    if check_gcs_file_exists(expected_gcs_url):
-                        logger.info(f"✅ Found video file in GCS via fallback: {expected_gcs_url}")
-                        return {'success': True, 'status': 'completed', 'video_url': expected_gcs_url}
-                    
-                    # Try alternative path structure
-                    expected_gcs_url_alt = f"gs://{get_gcs_bucket_name()}/videos/{operation_id}.mp4"
-                    
-                    if check_gcs_file_exists(expected_gcs_url_alt):
-                        logger.info(f"✅ Found video file in GCS via alternative fallback: {expected_gcs_url_alt}")
-                        return {'success': True, 'status': 'completed', 'video_url': expected_gcs_url_alt}
-
-                    logger.error("❌ VEO: Operation complete but no video URL found.")
-                    return {'success': False, 'status': 'failed', 'error': 'No video data in completed operation.'}
+                    return self._parse_completed_result(result, operation_name)
                 else:
                     return {'success': True, 'status': 'processing'}
             else:
-                error_msg = f"Status check failed: {response.status_code} - {response.text}"
+                # Polls repeat every few seconds; only dump the response body when debugging
+                error_msg = f"Status check failed: {response.status_code}"
                 logger.error(f"❌ VEO: {error_msg}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"📡 VEO: Status check error body: {response.text}")
                 return {'success': False, 'error': error_msg}
                 
         except Exception as e:
@@ -354,17 +432,11 @@ class VeoClient:
         """Generate video from image using Veo API."""
         logger.warning("💰 VEO: Real Veo image-to-video API call will be made. This may incur costs.")
         
-        token = self._get_auth_token()
-        if not token:
+        if not GOOGLE_CLOUD_AVAILABLE:
             error_msg = "Failed to get a valid authentication token."
             logger.error(f"❌ VEO: {error_msg}")
             return None
         
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json'
-        }
-        
         request_data = {
             "instances": instances,
             "parameters": parameters
@@ -374,13 +446,16 @@ class VeoClient:
         if 'storageUri' not in parameters:
             request_data["parameters"]["storageUri"] = f"gs://{get_gcs_bucket_name()}/videos/"
 
-        url = f"https://{self.location}-aiplatform.googleapis.com/v1/projects/{self.project_id}/locations/{self.location}/publishers/google/models/{self.model_id}:predictLongRunning"
+        url = f"{_VEO_MODEL_BASE}{self.model_id}:predictLongRunning"
             
         try:
             logger.info(f"🎬 VEO: Sending image-to-video request to: {url}")
-            logger.info(f"📦 VEO: Request data: {request_data}")
+            # The instances carry the base64-encoded source image; only format
+            # the payload when someone is actually debugging.
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"📦 VEO: Request data: {request_data}")
             
-            response = requests.post(url, headers=headers, json=request_data, timeout=30)
+            response = _auth_session().post(url, json=request_data, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
@@ -392,7 +467,7 @@ class VeoClient:
                     logger.error(f"❌ VEO: No operation name in response: {result}")
                     return None
             else:
-                error_msg = f"API request failed: {response.status_code} - {response.text}"
+                error_msg = f"API request failed: {response.status_code} - {response.text[:ERROR_BODY_LIMIT]}"
                 logger.error(f"❌ VEO: {error_msg}")
                 return None
                 
@@ -401,27 +476,45 @@ class VeoClient:
             return None
 
     def check_image_to_video_status(self, operation_name):
-        """Check the status of an image-to-video generation operation."""
-        token = self._get_auth_token()
-        if not token:
+        """Check the status of an image-to-video generation operation.
+        
+        Browsers poll this through /api/veo/status, so answers are briefly
+        shared between pollers; finished operations never change and are kept
+        longer. Failed checks are not cached.
+        """
+        now = time.monotonic()
+        cached = _status_cache.get(operation_name)
+        if cached and now < cached[0]:
+            return cached[1]
+        
+        result = self._check_image_to_video_status(operation_name)
+        status = result.get('status')
+        if status:
+            ttl = STATUS_CACHE_TTL if status == 'processing' else FINISHED_STATUS_CACHE_TTL
+            # Request threads insert concurrently; pruning iterates the dict
+            with _status_cache_lock:
+                if len(_status_cache) >= 256:
+                    for key in [key for key, (expires, _) in _status_cache.items() if expires <= now]:
+                        del _status_cache[key]
+                _status_cache[operation_name] = (now + ttl, result)
+        return result
+
+    def _check_image_to_video_status(self, operation_name):
+        if not GOOGLE_CLOUD_AVAILABLE:
             error_msg = "Failed to get a valid authentication token for status check."
             logger.error(f"❌ VEO: {error_msg}")
             return {'success': False, 'error': error_msg}
 
-        headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json'
-        }
-        
-        fetch_url = f"https://{self.location}-aiplatform.googleapis.com/v1/projects/{self.project_id}/locations/{self.location}/publishers/google/models/{self.model_id}:fetchPredictOperation"
+        fetch_url = f"{_VEO_MODEL_BASE}{self.model_id}:fetchPredictOperation"
         request_data = {"operationName": operation_name}
 
         try:
-            response = requests.post(fetch_url, headers=headers, json=request_data, timeout=30)
+            response = _auth_session().post(fetch_url, json=request_data, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
-                logger.info(f"📡 VEO: Image-to-video status check response: {result}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"📡 VEO: Image-to-video status check response: {result}")
                 
                 if result.get('done', False):
                     if 'error' in result:
@@ -453,7 +546,6 @@ class VeoClient:
                                 if video_url:
                                     # Convert GCS URL to signed URL for direct access
                                     try:
-                                        from app.gcs_utils import generate_signed_url
                                         signed_url = generate_signed_url(video_url, duration_days=1)  # 1 day
                                         videos.append({
                                             'index': i,
@@ -480,14 +572,17 @@ class VeoClient:
                     logger.warning("Image-to-video operation done but no video URLs found in expected path. Trying fallback.")
                     operation_id = operation_name.split('/')[-1]
                     
-                    # Try the standard Veo API folder structure
+                    # Try the standard Veo API folder structure, listing it once
+                    # rather than probing each sample with its own request
                     videos = []
+                    bucket_name = get_gcs_bucket_name()
+                    prefix = f"videos/{operation_id}/"
+                    existing = list_gcs_blob_names(bucket_name, prefix)
                     for i in range(4):  # Try up to 4 videos
-                        expected_gcs_url = f"gs://{get_gcs_bucket_name()}/videos/{operation_id}/sample_{i}.mp4"
+                        expected_gcs_url = f"gs://{bucket_name}/{prefix}sample_{i}.mp4"
                         
-                        if check_gcs_file_exists(expected_gcs_url):
+                        if f"{prefix}sample_{i}.mp4" in existing:
                             try:
-                                from app.gcs_utils import generate_signed_url
                                 signed_url = generate_signed_url(expected_gcs_url, duration_days=1)
                                 videos.append({
                                     'index': i,
@@ -516,29 +611,31 @@ class VeoClient:
                 else:
                     return {'success': True, 'status': 'processing', 'done': False}
             else:
-                error_msg = f"Status check failed: {response.status_code} - {response.text}"
+                # Polls repeat every few seconds; only dump the response body when debugging
+                error_msg = f"Status check failed: {response.status_code}"
                 logger.error(f"❌ VEO: {error_msg}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"📡 VEO: Status check error body: {response.text}")
                 return {'success': False, 'error': error_msg}
                 
         except Exception as e:
             logger.error(f"❌ VEO: Error checking image-to-video status: {e}")
             return {'success': False, 'error': str(e)}
 
+@lru_cache(maxsize=None)
 def get_gcs_bucket_name():
     """Helper to get GCS bucket name, avoiding circular import with gcs_utils."""
     return os.environ.get('GCS_BUCKET_NAME', 'prompt-veo-videos')
 
-def check_gcs_file_exists(gcs_url):
-    """Helper to check if a file exists in GCS, avoiding circular import."""
+def list_gcs_blob_names(bucket_name, prefix):
+    """Names of the objects under prefix, fetched in a single listing request."""
     if not GOOGLE_CLOUD_AVAILABLE:
-        return False
+        return set()
     try:
-        storage_client = storage.Client()
-        bucket_name = gcs_url.split('/')[2]
-        blob_name = '/'.join(gcs_url.split('/')[3:])
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(blob_name)
-        return blob.exists()
+        storage_client = get_gcs_client()
+        if not storage_client:
+            return set()
+        return {blob.name for blob in storage_client.list_blobs(bucket_name, prefix=prefix)}
     except Exception as e:
-        logger.error(f"❌ GCS: Error checking if file exists '{gcs_url}': {e}")
-        return False
+        logger.error(f"❌ GCS: Error listing 'gs://{bucket_name}/{prefix}': {e}")
+        return set()
@@ -1,6 +1,9 @@
 import subprocess
 import os
+import json
+import shutil
 import tempfile
+from functools import lru_cache
 from flask import current_app
 import logging
 import qrcode
@@ -12,6 +15,9 @@ logger = logging.getLogger(__name__)
 class VideoProcessor:
     """Handle video processing operations like watermarking"""
     
+    # QR code watermark temporarily disabled due to performance issues
+    WATERMARK_ENABLED = False
+    
     @staticmethod
     def add_watermark(input_path, output_path, watermark_text="PromptToVideo.com", qr_url=None):
         """
@@ -24,11 +30,12 @@ class VideoProcessor:
             qr_url: URL to encode in QR code (required)
         """
         try:
-            # Temporarily disable QR code watermark due to performance issues
-            # Just copy the video without watermark for now
+            if VideoProcessor.WATERMARK_ENABLED:
+                return VideoProcessor._add_qr_watermark(input_path, output_path, qr_url)
+            
+            # Watermark disabled: just copy the video without watermark
             logger.info(f"⚠️ QR code watermark temporarily disabled for performance")
             logger.info(f"📋 Copying video without watermark: {input_path} -> {output_path}")
-            import shutil
             shutil.copy2(input_path, output_path)
             logger.info(f"✅ Video copied successfully without watermark")
             return True
@@ -138,15 +145,11 @@ class VideoProcessor:
                     logger.info(f"🧹 Cleaned up temporary QR file")
                     
         except Exception as e:
-            logger.error(f"❌ Error adding QR watermark: {str(e)}")
-            logger.error(f"❌ Error type: {type(e).__name__}")
-            import traceback
-            logger.error(f"❌ Full traceback: {traceback.format_exc()}")
+            logger.exception(f"❌ Error adding QR watermark ({type(e).__name__}): {e}")
             
             # Fallback: try to copy the video without watermark
             logger.info(f"🔄 Attempting fallback: copying video without watermark...")
             try:
-                import shutil
                 shutil.copy2(input_path, output_path)
                 logger.info(f"✅ Fallback successful: video copied without watermark")
                 return True
@@ -204,10 +207,14 @@ class VideoProcessor:
             raise
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def _get_ffmpeg_path():
-        """Get the path to FFmpeg executable"""
-        import os
+        """Get the path to FFmpeg executable.
         
+        Resolved once per process: probing runs `ffmpeg -version`, a whole extra
+        process, and every thumbnail attempt asks for the path. A failed lookup
+        raises and is not cached.
+        """
         # Common FFmpeg installation paths (Windows, Linux, Cloud Run)
         possible_paths = [
             'ffmpeg',  # Try PATH first
@@ -285,7 +292,6 @@ class VideoProcessor:
                 logger.error(f"FFprobe failed: {result.stderr}")
                 return None
             
-            import json
             return json.loads(result.stdout)
             
         except Exception as e:
@@ -306,12 +312,15 @@ class VideoProcessor:
             # Get FFmpeg path
             ffmpeg_path = VideoProcessor._get_ffmpeg_path()
             
-            # Optimized command for faster thumbnail generation
+            # Seek on the input side: ffmpeg jumps to the keyframe before the
+            # offset (a range request when reading over HTTP) instead of
+            # decoding every frame up to it.
             cmd = [
                 ffmpeg_path,
-                '-i', video_path,
+                '-loglevel', 'error',
                 '-ss', time_offset,
-                '-vframes', '1',
+                '-i', video_path,
+                '-frames:v', '1',
                 '-vf', 'scale=320:180:force_original_aspect_ratio=decrease,pad=320:180:(ow-iw)/2:(oh-ih)/2',
                 '-q:v', '3',  # Slightly lower quality for faster processing
                 '-y',
@@ -327,7 +336,7 @@ class VideoProcessor:
                 cmd,
                 capture_output=True,
                 text=True,
-                timeout=120  # Increased timeout to 2 minutes
+                timeout=30
             )
             
             if result.returncode != 0:
@@ -344,7 +353,7 @@ class VideoProcessor:
                 return False
             
         except subprocess.TimeoutExpired:
-            logger.error(f"Thumbnail generation timed out after 120 seconds")
+            logger.error(f"Thumbnail generation timed out after 30 seconds")
             return False
         except Exception as e:
             logger.error(f"Error generating thumbnail: {str(e)}")
@@ -36,6 +36,9 @@ class Config:
     # Sentry configuration
     SENTRY_DSN = os.environ.get('SENTRY_DSN')
     
+    # Logging
+    LOG_LEVEL = os.environ.get('LOG_LEVEL') or 'INFO'
+    
     # Rate limiting
     RATELIMIT_STORAGE_URL = REDIS_URL
     RATELIMIT_DEFAULT = "100 per hour"
@@ -0,0 +1,41 @@
+"""
+Migration to add a partial index ordered like the pending video queue
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from sqlalchemy import text
+
+def migrate():
+    """Add idx_video_pending_queue for ranking pending videos"""
+    app = create_app()
+    
+    with app.app_context():
+        try:
+            print("Adding idx_video_pending_queue index...")
+            if db.engine.dialect.name == 'postgresql':
+                # CONCURRENTLY can't run inside a transaction block
+                with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                    conn.execute(text("""
+                        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_video_pending_queue
+                        ON videos (priority DESC, queued_at)
+                        WHERE status = 'pending'
+                    """))
+            else:
+                db.session.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_video_pending_queue
+                    ON videos (priority DESC, queued_at)
+                """))
+                db.session.commit()
+            print("✅ Added idx_video_pending_queue index")
+            print("🎉 Migration completed successfully!")
+            
+        except Exception as e:
+            print(f"❌ Migration failed: {e}")
+            db.session.rollback()
+            raise
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,41 @@
+"""
+Migration to add a partial status index to the videos table
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from sqlalchemy import text
+
+def migrate():
+    """Add idx_video_status for queue status lookups"""
+    app = create_app()
+    
+    with app.app_context():
+        try:
+            print("Adding idx_video_status index...")
+            if db.engine.dialect.name == 'postgresql':
+                # CONCURRENTLY can't run inside a transaction block
+                with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                    conn.execute(text("""
+                        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_video_status
+                        ON videos (status)
+                        WHERE status IN ('pending', 'processing')
+                    """))
+            else:
+                db.session.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_video_status
+                    ON videos (status)
+                """))
+                db.session.commit()
+            print("✅ Added idx_video_status index")
+            print("🎉 Migration completed successfully!")
+            
+        except Exception as e:
+            print(f"❌ Migration failed: {e}")
+            db.session.rollback()
+            raise
+
+if __name__ == "__main__":
+    migrate()
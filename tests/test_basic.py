@@ -3,6 +3,7 @@
 Basic tests for the application
 """
 
+import os
 import pytest
 from app import create_app, db
 from app.models import User, Video
@@ -35,6 +36,32 @@ class TestBasicFunctionality:
         assert app is not None
         assert app.config['TESTING'] is True
     
+    def test_logging_goes_through_queue(self, app):
+        """Test that app logs are queued to the background listener exactly once"""
+        from logging.handlers import QueueHandler
+        create_app('testing')
+        assert [type(h) for h in app.logger.handlers] == [QueueHandler]
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork')
+    def test_logging_survives_fork(self, app):
+        """Test that a worker forked after create_app (gunicorn preload_app) still writes its logs"""
+        import logging
+        import app as app_package
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.close(read_fd)
+                app_package._log_listener.handlers = (logging.StreamHandler(os.fdopen(write_fd, 'w')),)
+                app.logger.error('logged from forked worker')
+                app_package._log_listener.stop()
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        with os.fdopen(read_fd) as pipe:
+            assert 'logged from forked worker' in pipe.read()
+
     def test_home_page(self, client):
         """Test that home page loads"""
         response = client.get('/')
@@ -90,7 +117,109 @@ class TestGCSUtils:
             assert '123_' in filename
             assert filename.endswith('.mp4')
             assert gcs_url.startswith('gs://')
+    
+    def test_gcs_client_is_shared(self, app, monkeypatch):
+        """Test that the storage client is built once and reused"""
+        from app import gcs_utils
+        import requests
+        
+        class Client:
+            def __init__(self):
+                self._http = requests.Session()
+                created.append(self)
+        
+        created = []
+        monkeypatch.setattr(gcs_utils, '_storage_client', None)
+        monkeypatch.setattr(gcs_utils.storage, 'Client', Client)
+        client = gcs_utils.get_gcs_client()
+        assert client is gcs_utils.get_gcs_client()
+        assert len(created) == 1
+        assert client._http.get_adapter('https://storage.googleapis.com')._pool_maxsize == gcs_utils.HTTP_POOL_SIZE >= 32
+
+    
+    def test_copy_gcs_file_resumes_rewrite(self, app, monkeypatch):
+        """Test that server-side copies follow rewrite tokens until done"""
+        from app import gcs_utils
+        calls = []
+        
+        class Blob:
+            def __init__(self, name):
+                self.name = name
+            
+            def rewrite(self, source, token=None, if_generation_match=None):
+                calls.append((source.name, self.name, token))
+                return (None if token else 'more'), 0, 0
+        
+        class Bucket:
+            def blob(self, name):
+                return Blob(name)
+        
+        class Client:
+            def bucket(self, name):
+                return Bucket()
+        
+        monkeypatch.setattr(gcs_utils, 'get_gcs_client', lambda: Client())
+        url = gcs_utils.copy_gcs_file('gs://veo-output/raw/1.mp4', 'videos/1.mp4')
+        assert url == f"gs://{gcs_utils.get_gcs_bucket_name()}/videos/1.mp4"
+        assert calls == [('raw/1.mp4', 'videos/1.mp4', None), ('raw/1.mp4', 'videos/1.mp4', 'more')]
+
+    def test_upload_is_checksummed_and_create_only(self, app, monkeypatch, tmp_path):
+        """Test that uploads are crc32c-verified and a retried upload that already landed succeeds"""
+        from google.api_core.exceptions import PreconditionFailed
+        from app import gcs_utils
+        uploads = []
+        
+        class Blob:
+            def upload_from_filename(self, path, **kwargs):
+                uploads.append(kwargs)
+                raise PreconditionFailed('object exists')
+        
+        class Bucket:
+            def blob(self, name):
+                return Blob()
+        
+        class Client:
+            def bucket(self, name):
+                return Bucket()
+        
+        video = tmp_path / '1.mp4'
+        video.write_bytes(b'video')
+        monkeypatch.setattr(gcs_utils, 'get_gcs_client', lambda: Client())
+        url = gcs_utils.upload_file_to_gcs(str(video), 'videos/1.mp4')
+        assert url == f"gs://{gcs_utils.get_gcs_bucket_name()}/videos/1.mp4"
+        assert uploads == [{'if_generation_match': 0, 'checksum': 'crc32c'}]
+
+    def test_missing_thumbnail_uses_local_placeholder(self, app, client):
+        """Test that videos without a thumbnail get an absolute URL to the app's own raster image"""
+        from app.gcs_utils import generate_signed_thumbnail_url
+        with app.test_request_context(base_url='https://prompttovideo.com'):
+            url = generate_signed_thumbnail_url('gs://prompt-veo-videos/videos/2025/08/free/99_abc_1.mp4')
+        assert url == 'https://prompttovideo.com/static/img/video-placeholder.png'
+        response = client.get('/static/img/video-placeholder.png')
+        assert response.status_code == 200
+        assert response.mimetype == 'image/png'
+        response.close()
 
+class TestVideoProcessor:
+    """Test ffmpeg helpers"""
+    
+    def test_ffmpeg_path_is_resolved_once(self, monkeypatch):
+        """Test that locating ffmpeg doesn't spawn a probe for every thumbnail"""
+        import subprocess
+        from app.video_processor import VideoProcessor
+        probes = []
+        
+        def run(cmd, **kwargs):
+            probes.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, '', '')
+        
+        VideoProcessor._get_ffmpeg_path.cache_clear()
+        monkeypatch.setattr(subprocess, 'run', run)
+        try:
+            assert VideoProcessor._get_ffmpeg_path() == VideoProcessor._get_ffmpeg_path() == 'ffmpeg'
+            assert probes == [['ffmpeg', '-version']]
+        finally:
+            VideoProcessor._get_ffmpeg_path.cache_clear()
 
 class TestModels:
     """Test database models"""
@@ -120,6 +249,63 @@ class TestModels:
             assert video.quality == 'free'
             assert video.status == 'pending'
 
+    def test_stale_placeholder_thumbnail_is_replaced(self, app):
+        """Test that third-party placeholders stored by failed thumbnails resolve to the app's own"""
+        with app.test_request_context(base_url='https://prompttovideo.com'):
+            for stale in ('https://via.placeholder.com/320x180/000000/FFFFFF?text=Video+7',
+                          'https://placehold.co/1280x720/3b82f6/ffffff?text=Video+7'):
+                video = Video(thumbnail_url=stale, gcs_url='gs://prompt-veo-videos/videos/7.mp4')
+                assert video.get_thumbnail_url() == 'https://prompttovideo.com/static/img/video-placeholder.png'
+            video = Video(thumbnail_url='https://cdn.example.com/7.jpg', gcs_url='gs://prompt-veo-videos/videos/7.mp4')
+            assert video.get_thumbnail_url() == 'https://cdn.example.com/7.jpg'
+
+
+class TestEmail:
+    """Test outgoing email"""
+    
+    def test_completion_emails_share_connection(self, app):
+        """Test that consecutive completion emails reuse one SMTP connection"""
+        from app import email_utils, mail
+        with app.app_context(), mail.record_messages() as outbox:
+            email_utils._smtp.conn = None
+            assert email_utils.send_video_complete_email('a@example.com', 1, 'gs://test-bucket/1.mp4')
+            conn = email_utils._smtp.conn
+            assert email_utils.send_video_complete_email('b@example.com', 2, 'gs://test-bucket/2.mp4')
+            assert email_utils._smtp.conn is conn
+            assert [m.recipients for m in outbox] == [['a@example.com'], ['b@example.com']]
+    
+    def test_dropped_connection_is_closed_before_reconnecting(self, app, monkeypatch):
+        """Test that a dropped SMTP connection is closed, and live ones are closed at exit"""
+        import smtplib
+        from app import email_utils, mail
+        events = []
+        
+        class Connection:
+            def __init__(self, name):
+                self.name, self.host = name, None
+            
+            def __enter__(self):
+                return self
+            
+            def __exit__(self, *exc):
+                events.append(('close', self.name))
+            
+            def send(self, msg):
+                if self.name == 'stale':
+                    raise smtplib.SMTPServerDisconnected('idle timeout')
+                events.append(('send', self.name))
+        
+        monkeypatch.setattr(email_utils, '_open_connections', set())
+        monkeypatch.setattr(mail, 'connect', lambda: Connection('fresh'))
+        email_utils._smtp.conn = Connection('stale')
+        try:
+            email_utils._send_pooled(object())
+            assert events == [('close', 'stale'), ('send', 'fresh')]
+            email_utils._close_open_connections()
+            assert events[-1] == ('close', 'fresh')
+        finally:
+            email_utils._smtp.conn = None
+
 
 if __name__ == '__main__':
-    pytest.main([__file__]) 
\ No newline at end of file
+    pytest.main([__file__]) 
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Tests for background video tasks
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from app import db
+from app.models import User, Video
+from app import tasks
+from app.tasks import get_queue_stats, get_queue_positions, _poll_delay
+
+
+@pytest.fixture
+def queue_user(app):
+    """Create a user owning the queued videos"""
+    user = User(email='queue@example.com', username='queueuser', password_hash='hashed_password')
+    db.session.add(user)
+    db.session.commit()
+    yield user
+    Video.query.filter_by(user_id=user.id).delete()
+    db.session.delete(user)
+    db.session.commit()
+
+
+@pytest.fixture
+def queued_videos(queue_user):
+    """Create videos in a mix of queue states"""
+    videos = [
+        Video(prompt=f'Queued video {status}', quality='free', status=status, user_id=queue_user.id)
+        for status in ['pending', 'pending', 'processing', 'completed', 'failed', 'content_violation']
+    ]
+    db.session.add_all(videos)
+    db.session.commit()
+    return videos
+
+
+class TestQueueStats:
+    """Test queue statistics"""
+    
+    def test_get_queue_stats(self, queued_videos):
+        """Test that counts are grouped by status"""
+        stats = get_queue_stats(max_age=0)
+        assert stats == {
+            'pending': 2,
+            'processing': 1,
+            'completed': 1,
+            'failed': 1,
+            'total': 6
+        }
+    
+    def test_get_queue_stats_serves_recent_snapshot(self, queued_videos):
+        """Test that cached counts are reused until they expire"""
+        stats = get_queue_stats(max_age=0)
+        queued_videos[0].status = 'processing'
+        db.session.commit()
+        
+        assert get_queue_stats(max_age=60) == stats
+        assert get_queue_stats(max_age=0)['processing'] == 2
+
+
+class TestQueuePositions:
+    """Test ranking pending videos"""
+    
+    def test_queue_positions_follow_priority(self, queue_user):
+        """Test that queue positions rank pending videos highest priority first"""
+        low = Video(prompt='Low priority', status='pending', priority=1, user_id=queue_user.id)
+        high = Video(prompt='High priority', status='pending', priority=50, user_id=queue_user.id)
+        done = Video(prompt='Done', status='completed', priority=99, user_id=queue_user.id)
+        db.session.add_all([low, high, done])
+        db.session.commit()
+        
+        assert get_queue_positions([low.id, high.id, done.id]) == {high.id: 1, low.id: 2}
+        assert get_queue_positions([]) == {}
+
+
+class TestPolling:
+    """Test Veo status polling schedule"""
+    
+    def test_poll_delay_backs_off_to_cap(self):
+        """Test that polls start fast and settle at the cap"""
+        delays = [_poll_delay(attempt) for attempt in range(8)]
+        assert delays[0] == 2
+        assert delays == sorted(delays)
+        assert delays[-1] == 10
+
+
+class TestBackgroundWorkers:
+    """Test handing videos to the background worker pool"""
+    
+    def test_start_video_generation_runs_task(self, app, monkeypatch):
+        """Test that queued videos run under the worker app, not the caller's"""
+        from flask import Flask
+        seen = []
+        worker_app = Flask('worker')
+        monkeypatch.setattr(tasks, '_worker_app', worker_app)
+        monkeypatch.setattr(tasks, 'generate_video_task', lambda video_id: seen.append((video_id, tasks.current_app.name)) or True)
+        
+        assert tasks.start_video_generation(42).result(timeout=5) is True
+        assert seen == [(42, 'worker')]
+    
+    def test_premium_videos_have_their_own_pool(self):
+        """Test that premium jobs don't queue behind free ones"""
+        assert tasks._get_executor('premium') is not tasks._get_executor('free')
+        assert tasks._get_executor('premium') is tasks._get_executor('premium')
+        assert tasks._get_executor('unknown') is tasks._get_executor('free')
+    
+    def test_process_exits_with_generation_running(self):
+        """Test that pools start lazily and a worker restart doesn't wait for in-flight jobs"""
+        script = (
+            "import time\n"
+            "from app import tasks\n"
+            "assert not tasks._executors, 'pools created on import'\n"
+            "for pool in ('free', 'premium', 'email', 'thumbnail'):\n"
+            "    tasks._get_pool(pool).submit(time.sleep, 60)\n"
+            "time.sleep(0.2)\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        started = time.monotonic()
+        subprocess.run([sys.executable, '-c', script], cwd=root, check=True, timeout=30)
+        assert time.monotonic() - started < 15
+    
+    def test_worker_app_is_built_once(self, monkeypatch):
+        """Test that tasks started outside an app context share one app"""
+        built = []
+        monkeypatch.setattr(tasks, '_worker_app', None)
+        monkeypatch.setattr(tasks, 'create_app', lambda config_name=None: built.append(config_name) or object())
+        
+        assert tasks._get_worker_app() is tasks._get_worker_app()
+        assert len(built) == 1
+    
+    def test_completed_video_is_not_regenerated(self, queue_user, monkeypatch):
+        """Test that a finished video returns early without calling Veo"""
+        video = Video(prompt='Already done', status='completed', user_id=queue_user.id)
+        db.session.add(video)
+        db.session.commit()
+        monkeypatch.setattr(tasks, 'VeoClient', lambda: pytest.fail('Veo called for a completed video'))
+        
+        assert tasks.generate_video_task(video.id) is True
+        assert video.status == 'completed'
+
+
+class TestGenerateVideoTask:
+    """Test the end-to-end generation task with Veo and GCS stubbed out"""
+    
+    @pytest.fixture
+    def veo(self, monkeypatch):
+        """Stub the Veo client, GCS helpers and email pool, recording calls"""
+        calls = []
+        
+        class FakeVeoClient:
+            def generate_video(self, prompt, quality, duration):
+                return {'success': True, 'operation_name': 'operations/1', 'model_id': 'veo-2.0-generate-001'}
+        
+        class FakeExecutor:
+            def submit(self, fn, *args):
+                calls.append(('email',) + args[1:])
+        
+        monkeypatch.setattr(tasks, 'VeoClient', FakeVeoClient)
+        monkeypatch.setattr(tasks, 'VEO_POLL_FIRST_CHECK', 0)
+        monkeypatch.setattr(tasks, 'check_veo_status', lambda operation_name, model_id=None: {
+            'status': 'completed', 'video_url': 'gs://veo-output/raw/1.mp4'})
+        monkeypatch.setattr(tasks, 'copy_gcs_file', lambda src, dest: calls.append(('copy', src)) or f'gs://test-bucket/{dest}')
+        monkeypatch.setattr(tasks, 'delete_gcs_file', lambda url: calls.append(('delete', url)))
+        monkeypatch.setattr(tasks, 'generate_video_thumbnail_from_gcs', lambda url, *args: calls.append(('thumbnail', url)) or None)
+        monkeypatch.setitem(tasks._executors, 'email', FakeExecutor())
+        return calls
+    
+    def test_unwatermarked_video_is_copied_in_gcs(self, queue_user, veo):
+        """Test that with watermarking off the video never passes through local disk"""
+        video = Video(prompt='A cat surfing', quality='free', status='pending', user_id=queue_user.id)
+        db.session.add(video)
+        db.session.commit()
+        
+        assert tasks.generate_video_task(video.id) is True
+        assert video.status == 'completed'
+        assert video.veo_job_id == 'operations/1'
+        assert video.started_at is not None
+        # The failed thumbnail isn't stored; the placeholder is resolved when read
+        assert video.thumbnail_url is None
+        # The thumbnail overlaps the copy and reads the original before it is deleted
+        assert sorted(veo[:2]) == [('copy', 'gs://veo-output/raw/1.mp4'), ('thumbnail', 'gs://veo-output/raw/1.mp4')]
+        assert [call[0] for call in veo[2:]] == ['delete', 'email']
+    
+    def test_no_db_transaction_held_while_waiting_on_veo(self, queue_user, veo, monkeypatch):
+        """Test that polling and publishing run without a checked-out DB connection"""
+        in_transaction = []
+        
+        def check_veo_status(operation_name, model_id=None):
+            in_transaction.append(db.session().in_transaction())
+            return {'status': 'completed', 'video_url': 'gs://veo-output/raw/1.mp4'}
+        
+        def copy_gcs_file(src, dest):
+            in_transaction.append(db.session().in_transaction())
+            return f'gs://test-bucket/{dest}'
+        
+        monkeypatch.setattr(tasks, 'check_veo_status', check_veo_status)
+        monkeypatch.setattr(tasks, 'copy_gcs_file', copy_gcs_file)
+        video = Video(prompt='A horse sailing', quality='free', status='pending', user_id=queue_user.id)
+        db.session.add(video)
+        db.session.commit()
+        
+        assert tasks.generate_video_task(video.id) is True
+        assert in_transaction == [False, False]
+    
+    def test_watermark_reads_veo_output_over_http(self, queue_user, veo, monkeypatch):
+        """Test that the watermark step streams its input instead of downloading it"""
+        inputs = []
+        
+        def add_watermark(input_path, output_path, qr_url):
+            inputs.append(input_path)
+            open(output_path, 'wb').close()
+            return True
+        
+        monkeypatch.setattr(tasks.VideoProcessor, 'WATERMARK_ENABLED', True)
+        monkeypatch.setattr(tasks.VideoProcessor, 'add_watermark', add_watermark)
+        monkeypatch.setattr(tasks, 'upload_file_to_gcs', lambda path, dest: veo.append(('upload', path)) or f'gs://test-bucket/{dest}')
+        monkeypatch.setattr(tasks, 'generate_video_thumbnail_from_local', lambda path, *args: veo.append(('thumbnail', path)) or None)
+        video = Video(prompt='A dog skiing', quality='free', status='pending', user_id=queue_user.id)
+        db.session.add(video)
+        db.session.commit()
+        
+        assert tasks.generate_video_task(video.id) is True
+        assert inputs == ['https://storage.googleapis.com/veo-output/raw/1.mp4']
+        assert sorted(call[0] for call in veo[:2]) == ['thumbnail', 'upload']
+        assert [call[0] for call in veo[2:]] == ['delete', 'email']
+        assert veo[0][1] == veo[1][1]
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Tests for the Veo API client
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from google.auth.credentials import AnonymousCredentials, Credentials
+
+from app import veo_client
+
+
+@pytest.fixture
+def fake_default(monkeypatch):
+    """Replace google.auth.default with a counting stub"""
+    calls = []
+
+    def default(scopes=None):
+        calls.append(scopes)
+        return AnonymousCredentials(), 'test-project'
+
+    monkeypatch.setattr(veo_client, '_AUTH_SESSION', None)
+    monkeypatch.setattr(veo_client.google.auth, 'default', default)
+    return calls
+
+
+class TestAuthSession:
+    """Test the shared authorized session"""
+
+    def test_session_is_created_once(self, fake_default):
+        """Credentials are resolved once per process, not per call"""
+        first = veo_client._auth_session()
+        second = veo_client._auth_session()
+        assert first is second
+        assert fake_default == [veo_client.VEO_SCOPES]
+
+    def test_session_pools_https_connections(self, fake_default):
+        """Veo calls go through a pooled adapter with retries"""
+        adapter = veo_client._auth_session().get_adapter('https://us-central1-aiplatform.googleapis.com')
+        assert adapter._pool_maxsize == 32
+        assert adapter.max_retries.total == 3
+
+    def test_only_status_polls_retry_posts(self, fake_default):
+        """Transient 5xx on fetchPredictOperation are retried; predictLongRunning never is"""
+        session = veo_client._auth_session()
+        for model_id in ('veo-2.0-generate-001', 'veo-3.0-generate-001'):
+            status = session.get_adapter(f"{veo_client._VEO_MODEL_BASE}{model_id}:fetchPredictOperation")
+            generate = session.get_adapter(f"{veo_client._VEO_MODEL_BASE}{model_id}:predictLongRunning")
+            assert status.max_retries.is_retry('POST', 503)
+            assert not generate.max_retries.is_retry('POST', 503)
+
+    def test_session_refreshes_stale_tokens_in_background(self, monkeypatch):
+        """Requests never block on refreshing a token that is still valid"""
+        started, release = threading.Event(), threading.Event()
+
+        class SlowCredentials(Credentials):
+            def __init__(self):
+                super().__init__()
+                self.token = 'current'
+                # Inside google-auth's refresh window, but not yet expired
+                self.expiry = datetime.utcnow() + timedelta(minutes=2)
+
+            def refresh(self, request):
+                started.set()
+                release.wait(5)
+                self.token, self.expiry = 'refreshed', datetime.utcnow() + timedelta(hours=1)
+
+        monkeypatch.setattr(veo_client, '_AUTH_SESSION', None)
+        monkeypatch.setattr(veo_client.google.auth, 'default', lambda scopes=None: (SlowCredentials(), 'test-project'))
+        headers = {}
+        try:
+            veo_client._auth_session().credentials.before_request(veo_client.Request(), 'POST', 'https://example.com', headers)
+            assert headers['authorization'] == 'Bearer current'
+            assert started.wait(5)
+        finally:
+            release.set()
+
+    def test_auth_token_reuses_session_credentials(self, monkeypatch):
+        """Tokens come from the shared credentials, refreshed only once expired"""
+        class Credentials:
+            valid = False
+            token = None
+            refreshes = 0
+
+            def refresh(self, request):
+                self.refreshes += 1
+                self.valid, self.token = True, f'token-{self.refreshes}'
+
+        credentials = Credentials()
+        monkeypatch.setattr(veo_client, '_AUTH_SESSION', None)
+        monkeypatch.setattr(veo_client.google.auth, 'default', lambda scopes=None: (credentials, 'test-project'))
+
+        client = veo_client.VeoClient()
+        assert client._get_auth_token() == 'token-1'
+        assert client._get_auth_token() == 'token-1'
+        assert credentials.refreshes == 1
+
+
+class TestGenerateVideo:
+    """Test the generation request sent to Veo"""
+
+    @pytest.fixture
+    def posted(self, monkeypatch):
+        """Capture requests instead of sending them"""
+        calls = []
+
+        class Response:
+            status_code = 200
+
+            def json(self):
+                return {'name': 'operations/1'}
+
+        class Session:
+            def post(self, url, json=None, timeout=None):
+                calls.append((url, json))
+                return Response()
+
+        monkeypatch.setattr(veo_client, '_auth_session', lambda: Session())
+        return calls
+
+    def test_premium_request_uses_veo3_parameters(self, posted):
+        """Premium videos go to Veo 3 at 1080p with audio"""
+        result = veo_client.VeoClient().generate_video('a fox in snow', quality='premium')
+        url, body = posted[0]
+        assert result['model_id'] == 'veo-3.0-generate-001'
+        assert url.endswith('veo-3.0-generate-001:predictLongRunning')
+        assert body['instances'] == [{'prompt': 'a fox in snow'}]
+        assert body['parameters']['resolution'] == '1080p'
+        assert body['parameters']['generateAudio'] is True
+
+    def test_free_request_does_not_share_premium_parameters(self, posted):
+        """Free videos use Veo 2 without the premium-only options"""
+        result = veo_client.VeoClient().generate_video('a fox in snow', quality='free', duration=5)
+        parameters = posted[0][1]['parameters']
+        assert result['model_id'] == 'veo-2.0-generate-001'
+        assert parameters['durationSeconds'] == 5
+        assert 'resolution' not in parameters and 'generateAudio' not in parameters
+
+    def test_error_page_is_truncated_in_result(self, monkeypatch):
+        """A large error body doesn't end up whole in the stored error message"""
+        class Response:
+            status_code = 502
+            text = '<html>' + 'x' * 10000
+
+        class Session:
+            def post(self, url, json=None, timeout=None):
+                return Response()
+
+        monkeypatch.setattr(veo_client, '_auth_session', lambda: Session())
+        result = veo_client.VeoClient().generate_video('a fox in snow')
+        assert result['success'] is False
+        assert result['error'] == f"API request failed: 502 - {Response.text[:veo_client.ERROR_BODY_LIMIT]}"
+
+    def test_status_poll_requests_only_inspected_fields(self, monkeypatch):
+        """Status checks ask Veo for a partial response"""
+        sent = {}
+
+        class Response:
+            status_code = 200
+
+            def json(self):
+                return {'done': True, 'response': {'videos': [{'gcsUri': 'gs://veo-output/raw/1.mp4'}]}}
+
+        class Session:
+            def post(self, url, json=None, timeout=None, headers=None):
+                sent.update(url=url, headers=headers)
+                return Response()
+
+        monkeypatch.setattr(veo_client, '_auth_session', lambda: Session())
+        result = veo_client.VeoClient().check_video_status('operations/1', 'veo-2.0-generate-001')
+        assert result == {'success': True, 'status': 'completed', 'video_url': 'gs://veo-output/raw/1.mp4'}
+        assert sent['url'].endswith('veo-2.0-generate-001:fetchPredictOperation')
+        assert sent['headers'] == {'X-Goog-FieldMask': veo_client._STATUS_FIELD_MASK}
+
+    def test_rejected_field_mask_falls_back_to_full_response(self, monkeypatch):
+        """A 400 for the mask retries unmasked, and later polls skip the mask"""
+        sent = []
+
+        class Response:
+            def __init__(self, status_code):
+                self.status_code = status_code
+                self.text = 'Invalid field mask'
+
+            def json(self):
+                return {'done': True, 'response': {'videos': [{'gcsUri': 'gs://veo-output/raw/1.mp4'}]}}
+
+        class Session:
+            def post(self, url, json=None, timeout=None, headers=None):
+                sent.append(headers)
+                return Response(400 if headers else 200)
+
+        monkeypatch.setattr(veo_client, '_auth_session', lambda: Session())
+        monkeypatch.setattr(veo_client, '_status_field_mask_rejected', False)
+        client = veo_client.VeoClient()
+        assert client.check_video_status('operations/1', 'veo-2.0-generate-001')['status'] == 'completed'
+        assert client.check_video_status('operations/1', 'veo-2.0-generate-001')['status'] == 'completed'
+        assert sent == [{'X-Goog-FieldMask': veo_client._STATUS_FIELD_MASK}, None, None]
+
+    def test_completed_operation_without_uri_is_found_with_one_listing(self, monkeypatch):
+        """Falling back to the bucket lists the operation's prefix once"""
+        listed = []
+
+        class Response:
+            status_code = 200
+
+            def json(self):
+                return {'done': True, 'response': {}}
+
+        class Session:
+            def post(self, url, json=None, timeout=None, headers=None):
+                return Response()
+
+        def list_gcs_blob_names(bucket_name, prefix):
+            listed.append(prefix)
+            return {'videos/123.mp4'}
+
+        monkeypatch.setattr(veo_client, '_auth_session', lambda: Session())
+        monkeypatch.setattr(veo_client, 'list_gcs_blob_names', list_gcs_blob_names)
+        result = veo_client.VeoClient().check_video_status('projects/p/operations/123', 'veo-2.0-generate-001')
+        assert result['video_url'] == f"gs://{veo_client.get_gcs_bucket_name()}/videos/123.mp4"
+        assert listed == ['videos/123']
+
+    def test_completed_result_is_parsed_without_http(self):
+        """Terminal payloads can be classified without fetching them"""
+        client = veo_client.VeoClient()
+        failed = client._parse_completed_result({'done': True, 'error': {'message': 'quota'}}, 'operations/1')
+        assert failed == {'success': False, 'status': 'failed', 'error': 'quota'}
+        filtered = client._parse_completed_result(
+            {'done': True, 'response': {'raiMediaFilteredCount': 1, 'raiMediaFilteredReasons': ['unsafe']}}, 'operations/1')
+        assert filtered['status'] == 'content_violation' and filtered['details'] == 'unsafe'
+
+
+class TestImageToVideoStatus:
+    """Test the status endpoint's shared cache"""
+
+    @pytest.fixture
+    def fetches(self, monkeypatch):
+        """Count status fetches, answering with results[0]"""
+        calls = []
+        results = [{'success': True, 'status': 'processing', 'done': False}]
+        monkeypatch.setattr(veo_client, '_status_cache', {})
+        monkeypatch.setattr(veo_client.VeoClient, '_check_image_to_video_status',
+                            lambda self, name: calls.append(name) or results[0])
+        return calls, results
+
+    def test_concurrent_polls_share_one_fetch(self, fetches):
+        """Polls within the TTL reuse the last answer"""
+        calls, _ = fetches
+        client = veo_client.VeoClient()
+        assert client.check_image_to_video_status('operations/1')['status'] == 'processing'
+        assert client.check_image_to_video_status('operations/1')['status'] == 'processing'
+        assert calls == ['operations/1']
+
+    def test_failed_checks_are_not_cached(self, fetches):
+        """A transient error is retried on the next poll"""
+        calls, results = fetches
+        results[:] = [{'success': False, 'error': 'Status check failed: 503'}]
+        client = veo_client.VeoClient()
+        client.check_image_to_video_status('operations/1')
+        client.check_image_to_video_status('operations/1')
+        assert len(calls) == 2
+
+    def test_concurrent_polls_with_full_cache(self, fetches):
+        """Pruning a full cache while other threads insert doesn't raise"""
+        from concurrent.futures import ThreadPoolExecutor
+        client = veo_client.VeoClient()
+        veo_client._status_cache.update({f'operations/old-{i}': (0, {}) for i in range(256)})
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(client.check_image_to_video_status, [f'operations/{i}' for i in range(400)]))
+        assert not any(name.startswith('operations/old-') for name in veo_client._status_cache)